@@ -73,6 +73,12 @@ app.secret_key = os.getenv('SECRET_KEY')
 app.config['MONGO_URI'] = os.getenv('MONGODB_URI')
 mongo = PyMongo(app)
 
+# The slot engine range-queries meetings by date, so keep that lookup indexed
+try:
+    mongo.db.meetings.create_index('meeting_datetime')
+except Exception as e:
+    print(f"Failed to ensure MongoDB indexes: {e}")
+
 # Email configuration
 app.config['MAIL_SERVER'] = 'smtp.gmail.com'
 app.config['MAIL_PORT'] = 465
@@ -164,21 +170,42 @@ def debug_db():
         'meetings': meetings
     })
 
+# Booking horizon: slots are offered from today up to this many days ahead
+SLOT_WINDOW_DAYS = 90
+
+def parse_slot_window(args, today):
+    """Resolve the optional `from`/`to` query params (YYYY-MM-DD, `to` inclusive) into a [start, end) date window."""
+    horizon = today + timedelta(days=SLOT_WINDOW_DAYS)
+    start, end = today, horizon
+    if args.get('from'):
+        start = min(horizon, max(today, datetime.fromisoformat(args['from']).date()))
+    if args.get('to'):
+        end = min(horizon, datetime.fromisoformat(args['to']).date() + timedelta(days=1))
+    return start, max(start, end)
+
 @app.route('/api/available-slots')
 def get_available_slots():
-    # Generate all time slots for the next 90 days
+    # Generate time slots for the requested window (defaults to the next 90 days)
     # Business hours: 9 AM - 5 PM, Monday-Friday
     slots = []
     today = datetime.now().date()
+    try:
+        window_start, window_end = parse_slot_window(request.args, today)
+    except ValueError:
+        return jsonify({'message': 'Invalid date range. Use YYYY-MM-DD for from/to.'}), 400
 
-    # Fetch all booked meeting datetimes at once
+    # Fetch booked meeting datetimes inside the window only (indexed range query)
     booked_slots = set()
-    for meeting in mongo.db.meetings.find({}, {"meeting_datetime": 1}):
+    window_query = {"meeting_datetime": {
+        "$gte": datetime.combine(window_start, datetime.min.time()),
+        "$lt": datetime.combine(window_end, datetime.min.time())
+    }}
+    for meeting in mongo.db.meetings.find(window_query, {"meeting_datetime": 1, "_id": 0}):
         if meeting.get('meeting_datetime'):
             booked_slots.add(meeting['meeting_datetime'])
 
-    for day_offset in range(90):
-        current_date = today + timedelta(days=day_offset)
+    for day_offset in range((window_end - window_start).days):
+        current_date = window_start + timedelta(days=day_offset)
 
         # Skip weekends
         if current_date.weekday() >= 5:  # Saturday = 5, Sunday = 6
@@ -202,7 +229,11 @@ def get_available_slots():
                 'day_short': current_date.strftime('%a')
             })
 
-    return jsonify({'slots': slots})
+    return jsonify({
+        'slots': slots,
+        'from': window_start.isoformat(),
+        'to': (window_end - timedelta(days=1)).isoformat()
+    })
 
 @app.route('/book-meeting', methods=['POST'])
 def book_meeting():
@@ -0,0 +1,102 @@
+"""
+Optional digest mode for admin notifications.
+
+With ADMIN_DIGEST_MINUTES set, admin-audience emails handed to the outbox
+are parked in the `admin_digest` collection instead of being sent one by one.
+Once the oldest parked entry is ADMIN_DIGEST_MINUTES old, or
+ADMIN_DIGEST_MAX_EVENTS are waiting, they are rolled into a single summary
+email that goes through the outbox as usual. User-facing emails are never
+buffered.
+
+A digest that is due is flushed by the outbox workers' poll. Without workers
+(inline/serverless outbox, or EMAIL_WORKERS=0) nothing would flush it on
+time, so digest mode is turned off there and admin notices are sent directly.
+
+Entries are claimed for a flush with an atomic batch marker, so several
+processes can flush concurrently without sending an entry twice. A batch
+left behind by a crashed flusher is picked up again after a while.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from mail_templates import templates
+
+# A claimed batch that hasn't been flushed by then is assumed abandoned
+STALE_BATCH = timedelta(minutes=10)
+
+
+class AdminDigest:
+    def __init__(self, mongo, outbox, interval_minutes=0, max_events=50):
+        self.mongo = mongo
+        self.outbox = outbox
+        self.interval = timedelta(minutes=interval_minutes)
+        self.max_events = max_events
+        self.enabled = interval_minutes > 0
+        if self.enabled and (outbox.inline or outbox.workers <= 0):
+            print("admin digest: no outbox workers to flush it on time; sending admin notices directly")
+            self.enabled = False
+
+    @property
+    def collection(self):
+        return self.mongo.db.admin_digest
+
+    def ensure_indexes(self):
+        self.collection.create_index([('batch', 1), ('created_at', 1)])
+
+    def add(self, message, record=None):
+        """Park an admin notification; flushes straight away if the digest is due."""
+        doc = {
+            'subject': message.subject,
+            'recipients': list(message.recipients),
+            'body': message.body,
+            'created_at': datetime.now(timezone.utc),
+            'batch': None
+        }
+        if record is not None:
+            doc['record'] = {'collection': record[0], 'id': record[1]}
+        entry_id = self.collection.insert_one(doc).inserted_id
+        self.flush_due()
+        return entry_id
+
+    def flush_due(self):
+        """Flush if enough entries are waiting or the oldest one has waited long enough."""
+        if not self.enabled:
+            return 0
+        now = datetime.now(timezone.utc)
+        pending = {'$or': [
+            {'batch': None},
+            {'claimed_at': {'$lte': now - STALE_BATCH}}
+        ]}
+        oldest = self.collection.find_one(pending, sort=[('created_at', 1)], projection={'created_at': 1})
+        if oldest is None:
+            return 0
+        created_at = oldest['created_at']
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        if created_at > now - self.interval and self.collection.count_documents(pending) < self.max_events:
+            return 0
+        return self.flush()
+
+    def flush(self):
+        """Send everything waiting as one summary per recipient list; returns entries sent."""
+        now = datetime.now(timezone.utc)
+        batch = uuid.uuid4().hex
+        self.collection.update_many(
+            {'$or': [{'batch': None}, {'claimed_at': {'$lte': now - STALE_BATCH}}]},
+            {'$set': {'batch': batch, 'claimed_at': now}}
+        )
+        entries = list(self.collection.find({'batch': batch}).sort('created_at', 1))
+        if not entries:
+            return 0
+
+        by_recipients = {}
+        for entry in entries:
+            by_recipients.setdefault(tuple(entry['recipients']), []).append(entry)
+        for recipients, group in by_recipients.items():
+            message = templates.message('admin_digest', list(recipients), entries=group)
+            records = [entry['record'] for entry in group if entry.get('record')]
+            self.outbox.enqueue(message, 'admin', records=records, digest=False)
+
+        self.collection.delete_many({'batch': batch})
+        print(f"admin digest: flushed {len(entries)} notification(s)")
+        return len(entries)
@@ -1,28 +1,55 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash, Response
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash, Response, stream_with_context
 from jinja2.exceptions import TemplateNotFound
-from flask_mail import Mail, Message
+from flask_mail import Message
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from flask_pymongo import PyMongo
 from flask_cors import CORS
-import csv
-from io import StringIO
 from mail import (
-    send_contact_email,
-    send_meeting_email,
-    # Bring in both the user + admin meeting request helpers so we can send both
-    send_meeting_request_confirmation_email,
-    send_meeting_request_email,
-    send_meeting_reschedule_email
+    contact_emails,
+    meeting_scheduled_emails,
+    # Both the user confirmation and the admin notice for a new meeting request
+    meeting_request_confirmation_email,
+    meeting_request_email,
+    meeting_reschedule_emails,
+    meeting_link_admin_email
 )
-from pymongo import ReturnDocument
+from mail_transport import create_mail
+from outbox import EmailOutbox
+from admin_digest import AdminDigest
+from newsletter import NewsletterSender
+from reminders import ReminderScheduler
+from dashboard import DashboardService
+from counters import CollectionCounters
+from stats import StatsRollup
+from blog_search import BlogSearch
+from exports import (
+    CONTACTS as CONTACT_EXPORT,
+    MEETINGS as MEETING_EXPORT,
+    DATASETS as EXPORT_DATASETS,
+    TOMBSTONES as EXPORT_TOMBSTONES,
+    ExportUnavailable,
+    delta_page,
+    ensure_indexes as ensure_export_indexes,
+    export_stream,
+    record_deleted,
+    gzip_chunks,
+    json_default
+)
+from pymongo import DeleteOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 from dotenv import load_dotenv
 import os
-from datetime import datetime, timedelta
+import hmac
+import json
+from datetime import datetime, timedelta, timezone
 import traceback
 from werkzeug.security import generate_password_hash, check_password_hash
 import uuid
 from bson import ObjectId
 from models import db, Contact, Meeting, Blog, Topic, SubTopic, BlogMedia
+from availability import AvailabilityCache
+from scheduling import Schedule, ConflictIndex
+from slot_events import SlotEventBroker
 
 class Pagination:
     def __init__(self, page, per_page, total):
@@ -82,6 +109,13 @@ app.secret_key = os.getenv('SECRET_KEY')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('SQLALCHEMY_DATABASE_URI', 'sqlite:///aidaddy.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
+# Full-text index for blog search (FTS5 on SQLite, tsvector on PostgreSQL; see blog_search.py)
+blog_search = BlogSearch(db)
+with app.app_context():
+    try:
+        blog_search.setup()
+    except Exception as e:
+        print(f"Failed to set up blog search: {e}")
 
 # Mail configuration
 app.config['MAIL_SERVER'] = 'smtp.gmail.com'
@@ -141,7 +175,58 @@ CORS(app, resources={
         "supports_credentials": True if allowed_frontend_origins != ['*'] else False
     }
 })
-mail = Mail(app)
+# Pooled SMTP by default; MAIL_TRANSPORT=file|memory keeps mail local (see mail_transport.py)
+mail = create_mail(app)
+
+# Outgoing email goes through a durable queue drained by background workers.
+# Serverless functions can't run workers past the response, so they deliver inline.
+outbox = EmailOutbox(
+    app, mongo, mail,
+    workers=int(os.getenv('EMAIL_WORKERS', '2')),
+    max_attempts=int(os.getenv('EMAIL_MAX_ATTEMPTS', '6')),
+    base_delay=int(os.getenv('EMAIL_RETRY_SECONDS', '30')),
+    inline=os.getenv('NETLIFY') == 'true' or os.getenv('EMAIL_OUTBOX_INLINE') == 'true'
+)
+# Optionally roll admin notifications into one summary every N minutes / N events
+outbox.digest = AdminDigest(
+    mongo, outbox,
+    interval_minutes=int(os.getenv('ADMIN_DIGEST_MINUTES', '0')),
+    max_events=int(os.getenv('ADMIN_DIGEST_MAX_EVENTS', '50'))
+)
+
+# Blog newsletter fan-out (see newsletter.py)
+newsletter = NewsletterSender(
+    app, mongo, mail,
+    batch_size=int(os.getenv('NEWSLETTER_BATCH_SIZE', '50')),
+    rate_per_minute=int(os.getenv('NEWSLETTER_RATE_PER_MINUTE', '600')),
+    lease_seconds=int(os.getenv('NEWSLETTER_LEASE_SECONDS', '300')),
+    background=not outbox.inline
+)
+
+# Business hours, holidays, time zone and horizon for the slot engine (see scheduling.py)
+schedule = Schedule.from_env(meeting_minutes=Meeting.duration.default.arg)
+
+# Meeting reminders; REMINDERS_MODE=standalone runs them in `python reminders.py` instead
+reminders = ReminderScheduler(
+    app, mongo, outbox, schedule,
+    offsets=[int(m) for m in os.getenv('REMINDER_OFFSETS', '1440,15').split(',') if m.strip()],
+    grace_minutes=int(os.getenv('REMINDER_GRACE_MINUTES', '10')),
+    tick_seconds=int(os.getenv('REMINDER_TICK_SECONDS', '30')),
+    lease_seconds=int(os.getenv('REMINDER_LEASE_SECONDS', '90'))
+)
+
+
+# Admin dashboard tables (see dashboard.py); totals come from maintained counters (see counters.py)
+counters = CollectionCounters(
+    mongo,
+    cache_ttl=int(os.getenv('COUNT_CACHE_TTL', '30')),
+    reconcile_seconds=int(os.getenv('COUNT_RECONCILE_SECONDS', '600'))
+)
+dashboard = DashboardService(mongo, counters)
+
+# Daily analytics rollup kept current by the write paths (see stats.py)
+stats = StatsRollup(mongo)
+outbox.stats = stats
 
 
 # Initialize default admin in DB if not present
@@ -168,6 +253,91 @@ def create_default_admin():
 # Ensure default admin exists on startup
 create_default_admin()
 
+
+# How long an expired slot hold is kept before MongoDB's TTL monitor deletes it
+HOLD_CLEANUP_SECONDS = 600
+INDEX_OPTIONS_CONFLICT = 85
+
+# Meetings in these states hold their slot; anything else (e.g. cancelled) frees it
+ACTIVE_MEETING_STATUSES = ['pending', 'scheduled', 'completed']
+MEETING_STATUSES = ACTIVE_MEETING_STATUSES + ['cancelled']
+
+
+def ensure_slot_index():
+    """One active meeting per slot.
+
+    The index also serves the slot engine's date-range queries, which filter on the
+    same statuses. It replaces the plain index on meeting_datetime, which is dropped
+    only once the new one exists, so a failed build (duplicate active bookings, or
+    MongoDB older than 6.0, which rejects $in in a partial filter) leaves the old
+    index in place. `python update_db_schema.py` lists duplicate slots to resolve.
+    """
+    try:
+        mongo.db.meetings.create_index(
+            'meeting_datetime',
+            name='unique_active_slot',
+            unique=True,
+            partialFilterExpression={'status': {'$in': ACTIVE_MEETING_STATUSES}}
+        )
+    except DuplicateKeyError as e:
+        raise RuntimeError(f"duplicate active bookings exist ({e}); run update_db_schema.py to list them") from e
+    if 'meeting_datetime_1' in mongo.db.meetings.index_information():
+        mongo.db.meetings.drop_index('meeting_datetime_1')
+
+
+def ensure_hold_indexes():
+    # Temporary slot holds: one per slot. Queries treat a hold as gone at expires_at; MongoDB
+    # removes it a while later, so the slot event stream can still see it and announce it freed.
+    mongo.db.slot_holds.create_index('meeting_datetime', unique=True)
+    try:
+        mongo.db.slot_holds.create_index('expires_at', expireAfterSeconds=HOLD_CLEANUP_SECONDS)
+    except OperationFailure as e:
+        if e.code != INDEX_OPTIONS_CONFLICT:
+            raise
+        # Existing TTL index with the old delay
+        mongo.db.command('collMod', 'slot_holds',
+                         index={'keyPattern': {'expires_at': 1}, 'expireAfterSeconds': HOLD_CLEANUP_SECONDS})
+
+
+def seed_counters():
+    for name in ('contacts', 'meetings'):
+        counters.seed(name)
+
+
+def ensure_indexes():
+    # Each component is set up on its own, so one failure doesn't skip the rest
+    steps = [
+        ('meeting slot', ensure_slot_index),
+        ('slot hold', ensure_hold_indexes),
+        ('email outbox', outbox.ensure_indexes),
+        ('admin digest', outbox.digest.ensure_indexes),
+        ('newsletter', newsletter.ensure_indexes),
+        ('reminder', reminders.ensure_indexes),
+        ('dashboard', dashboard.ensure_indexes),
+        ('counter', seed_counters),
+        ('export', lambda: ensure_export_indexes(mongo.db))
+    ]
+    for name, step in steps:
+        try:
+            step()
+        except Exception as e:
+            print(f"Failed to ensure {name} MongoDB indexes: {e}")
+
+ensure_indexes()
+
+
+def start_background():
+    """Start this process's background work: outbox workers, stalled newsletters, reminders.
+
+    Called by the server entry points (run.py, `python app.py`, gunicorn's post_worker_init),
+    never on import, so scripts and serverless handlers that import the app stay passive.
+    """
+    # Pick up anything left queued by a previous process
+    outbox.start()
+    newsletter.resume()
+    if os.getenv('REMINDERS_MODE', 'embedded') == 'embedded' and not outbox.inline:
+        reminders.start()
+
 # Login manager
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -249,33 +419,42 @@ def contact():
     email = data.get('email')
     message = data.get('message')
 
-    # Attempt to send email, note result, but save the contact regardless
-    email_sent = False
+    # Save the contact first; emails are queued against it and the outbox
+    # worker flips the email_sent_* flags once each one is delivered
     try:
-        result = send_contact_email(mail, name, email, message)
-        email_sent = bool(result.get('user') or result.get('admin'))
-        # Log if admin notification failed
-        if not result.get('admin'):
-            print(f"Contact email: admin notification not sent or failed. Errors: {result.get('errors')}")
-    except Exception as e:
-        print(f"Email sending failed: {e}")
-
-    # Save to database regardless
-    try:
-        # Save flags for both user and admin email delivery
-        mongo.db.contacts.insert_one({
+        contact_doc = {
             "name": name,
             "email": email,
             "message": message,
             "timestamp": datetime.now(),
-            "email_sent": email_sent,
-            "email_sent_user": bool(result.get('user')) if isinstance(result, dict) else email_sent,
-            "email_sent_admin": bool(result.get('admin')) if isinstance(result, dict) else False
-        })
+            "updated_at": datetime.now(timezone.utc),
+            "email_sent": False,
+            "email_sent_user": False,
+            "email_sent_admin": False
+        }
+        contact_id = mongo.db.contacts.insert_one(contact_doc).inserted_id
     except Exception as e:
         print(f"Failed to save contact: {e}")
-    
-    if email_sent:
+        contact_id = None
+
+    if contact_id:
+        # Bookkeeping only; the contact is saved either way
+        try:
+            counters.changed('contacts', 1)
+            stats.contact_created(contact_doc)
+        except Exception as e:
+            print(f"Failed to update contact counters: {e}")
+
+    try:
+        queued = outbox.enqueue_all(contact_emails(name, email, message),
+                                    record=('contacts', contact_id) if contact_id else None)
+        if 'admin' not in queued:
+            print("Contact email: admin notification not queued (MAIL_USERNAME not configured)")
+    except Exception as e:
+        print(f"Failed to queue contact emails: {e}")
+        queued = {}
+
+    if queued:
         return jsonify({"message": "Thank you for contacting us! We will get back to you soon."})
     else:
         return jsonify({"message": "Your message has been saved. We will contact you soon."})
@@ -299,20 +478,175 @@ def debug_db():
         'meetings': meetings
     })
 
+# Rendered availability per window; booking writes invalidate the dates they touch
+slot_cache = AvailabilityCache(
+    schedule,
+    ttl=int(os.getenv('SLOT_CACHE_TTL', '30')),
+    max_windows=int(os.getenv('SLOT_CACHE_MAX_WINDOWS', '256'))
+)
+
+# Live slot-taken / slot-freed deltas for connected booking pages (see slot_events.py)
+slot_events = SlotEventBroker(max_clients=int(os.getenv('SLOT_EVENTS_MAX_CLIENTS', '100')))
+
+# How long a slot stays reserved for a visitor filling in the booking form
+SLOT_HOLD_MINUTES = int(os.getenv('SLOT_HOLD_MINUTES', '5'))
+# Holds are unauthenticated, so cap how many slots one client address may hold at once
+SLOT_HOLD_MAX_PER_CLIENT = int(os.getenv('SLOT_HOLD_MAX_PER_CLIENT', '3'))
+
+
+def parse_slot_window(args, today):
+    """Resolve the optional `from`/`to` query params into a [start, end) date window.
+
+    Like every date-range parameter in this API (exports, stats), both bounds are ISO
+    dates (YYYY-MM-DD) and `to` is inclusive. They are clamped to the booking horizon,
+    so the widget can page through one week at a time.
+    """
+    horizon = today + timedelta(days=schedule.horizon_days)
+    start, end = today, horizon
+    if args.get('from'):
+        start = min(horizon, max(today, datetime.fromisoformat(args['from']).date()))
+    if args.get('to'):
+        end = min(horizon, datetime.fromisoformat(args['to']).date() + timedelta(days=1))
+    return start, max(start, end)
+
+
+def load_conflicts(start, end, exclude_id=None, include_holds=True, hold_token=None):
+    """Interval index of the active meetings (and unexpired holds) that could overlap [start, end).
+
+    `hold_token` excludes the caller's own hold so it does not block its booking.
+    This is a read before the write: the unique slot index only stops two active meetings
+    starting at the same time, so overlapping meetings with different starts can still
+    both get through if they are written concurrently.
+    """
+    lookback = schedule.conflict_lookback(start)
+    query = {
+        "meeting_datetime": {"$gte": lookback, "$lt": end},
+        "status": {"$in": ACTIVE_MEETING_STATUSES}
+    }
+    if exclude_id is not None:
+        query["_id"] = {"$ne": exclude_id}
+    intervals = [
+        schedule.meeting_interval(meeting['meeting_datetime'], meeting.get('duration'))
+        for meeting in mongo.db.meetings.find(query, {"meeting_datetime": 1, "duration": 1, "_id": 0})
+        if meeting.get('meeting_datetime')
+    ]
+    if include_holds:
+        hold_query = {
+            "meeting_datetime": {"$gte": lookback, "$lt": end},
+            "expires_at": {"$gt": datetime.now(timezone.utc)}
+        }
+        if hold_token:
+            hold_query["token"] = {"$ne": hold_token}
+        intervals.extend(
+            schedule.meeting_interval(hold['meeting_datetime'])
+            for hold in mongo.db.slot_holds.find(hold_query, {"meeting_datetime": 1, "_id": 0})
+        )
+    return ConflictIndex(intervals)
+
+
+def slots_changed(start, duration=None):
+    """Invalidate cached availability around a write and push the new state of the affected slots."""
+    if not start:
+        return
+    start, end = schedule.meeting_interval(start, duration)
+    slot_cache.invalidate(start)
+    try:
+        affected = schedule.slots_overlapping(start, end)
+        if not affected:
+            return
+        conflicts = load_conflicts(affected[0], schedule.meeting_interval(affected[-1])[1])
+        taken, freed = [], []
+        for slot in affected:
+            (taken if conflicts.overlaps(*schedule.meeting_interval(slot)) else freed).append(slot.isoformat())
+        if taken:
+            slot_events.publish('slot-taken', {'slots': taken})
+        if freed:
+            slot_events.publish('slot-freed', {'slots': freed})
+    except Exception as e:
+        print(f"Failed to publish slot changes: {e}")
+
+
+class LapsedHolds:
+    """Announces holds that expired without being booked or released (nothing writes when that happens)."""
+
+    def __init__(self):
+        self.checked_until = datetime.now(timezone.utc)
+
+    def publish(self):
+        now = datetime.now(timezone.utc)
+        # Expired holds are only kept for HOLD_CLEANUP_SECONDS
+        since = max(self.checked_until, now - timedelta(seconds=HOLD_CLEANUP_SECONDS))
+        lapsed = list(mongo.db.slot_holds.find(
+            {"expires_at": {"$gt": since, "$lte": now}}, {"meeting_datetime": 1, "_id": 0}))
+        self.checked_until = now
+        for hold in lapsed:
+            slots_changed(hold.get('meeting_datetime'))
+
+
+lapsed_holds = LapsedHolds()
+slot_events.on_tick = lapsed_holds.publish
+
+
+@app.route('/api/slots/events')
+def slot_event_stream():
+    """Server-Sent Events feed of slot-taken / slot-freed deltas for the booking page.
+
+    Serverless deployments can't hold a connection open, so they answer 204, which tells
+    EventSource to stop reconnecting; the page then keeps using /api/available-slots.
+    """
+    if os.getenv('NETLIFY', '') == 'true' or os.getenv('SLOT_EVENTS_DISABLED', '') == 'true':
+        return Response(status=204)
+    subscriber = slot_events.subscribe(request.headers.get('Last-Event-ID', type=int))
+    if subscriber is None:
+        return Response(status=204)
+    return Response(
+        stream_with_context(slot_events.stream(subscriber)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @app.route('/api/available-slots')
 def get_available_slots():
-    # Generate all time slots for the next 90 days
-    # Business hours: 9 AM - 5 PM, Monday-Friday
-    slots = []
-    today = datetime.now().date()
-
-    # Fetch all booked meeting datetimes at once
+    # Generate time slots for the requested window (defaults to the whole booking horizon)
     try:
-        booked_slots = set()
-        for meeting in mongo.db.meetings.find({}, {"meeting_datetime": 1}):
-            if meeting.get('meeting_datetime'):
-                booked_slots.add(meeting['meeting_datetime'])
-        print(f"get_available_slots: found {len(booked_slots)} booked slots in DB")
+        window_start, window_end = parse_slot_window(request.args, schedule.today())
+    except ValueError:
+        return jsonify({'message': 'Invalid date range. Use YYYY-MM-DD for from/to.'}), 400
+    # `format=compact` returns a shared template plus a per-day free-slot bitstring; verbose stays the default
+    slot_format = request.args.get('format', 'verbose')
+    if slot_format not in ('verbose', 'compact'):
+        return jsonify({'message': 'Invalid format. Use verbose or compact.'}), 400
+
+    cache_key = (window_start, window_end, slot_format)
+    cached = slot_cache.get(cache_key)
+    if cached is None:
+        generation = slot_cache.generation
+        payload, complete = build_available_slots(window_start, window_end, slot_format)
+        if not complete:
+            # Bookings could not be read, so this "all free" answer must not be cached or revalidated
+            response = jsonify(payload)
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+        cached = slot_cache.put(cache_key, payload, generation)
+
+    response = Response(cached.body, mimetype='application/json')
+    response.set_etag(cached.etag)
+    # Let browsers keep the payload but revalidate each time (cheap 304 on a hit)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+def build_available_slots(window_start, window_end, slot_format='verbose'):
+    """Build the slots payload; the flag is False when bookings could not be loaded."""
+    complete = True
+    # Index the meetings overlapping the window (indexed range query) for O(log n) slot checks
+    try:
+        conflicts = load_conflicts(
+            datetime.combine(window_start, datetime.min.time()),
+            datetime.combine(window_end, datetime.min.time())
+        )
+        print(f"get_available_slots: found {len(conflicts)} booked meetings between {window_start} and {window_end}")
         # Log request context for debugging network errors seen by frontend
         try:
             origin = request.headers.get('Origin')
@@ -324,34 +658,116 @@ def get_available_slots():
     except Exception as e:
         print(f"DB error in get_available_slots: {e}")
         import traceback; traceback.print_exc()
-        booked_slots = set()
+        conflicts = ConflictIndex()
+        complete = False
 
-    for day_offset in range(90):
-        current_date = today + timedelta(days=day_offset)
-
-        # Skip weekends
-        if current_date.weekday() >= 5:  # Saturday = 5, Sunday = 6
-            continue
-
-        # Generate hourly slots from 9 AM to 4 PM (30-min meetings)
-        for hour in range(9, 17):  # 9 AM to 4 PM
-            slot_time = datetime.combine(current_date, datetime.min.time().replace(hour=hour))
-
-            # Check if slot is already booked
-            available = slot_time not in booked_slots
+    days = [window_start + timedelta(days=offset) for offset in range((window_end - window_start).days)]
+    if slot_format == 'compact':
+        payload = schedule.compact_payload(days, conflicts)
+        payload.update({'from': window_start.isoformat(), 'to': (window_end - timedelta(days=1)).isoformat()})
+        return payload, complete
 
+    slots = []
+    for current_date in days:
+        for day_slot in slot_cache.day_slots(current_date):
+            available = not conflicts.overlaps(*schedule.meeting_interval(day_slot['slot_time']))
             slots.append({
-                'datetime': slot_time.isoformat(),
-                'display': slot_time.strftime('%A, %B %d at %I:%M %p'),
+                'datetime': day_slot['datetime'],
+                'utc': day_slot['utc'],
+                'display': day_slot['display'],
                 'available': available,
                 'booked': not available,
-                'date': current_date.isoformat(),
-                'time': slot_time.strftime('%I:%M %p'),
-                'day': current_date.strftime('%A'),
-                'day_short': current_date.strftime('%a')
+                'date': day_slot['date'],
+                'time': day_slot['time'],
+                'day': day_slot['day'],
+                'day_short': day_slot['day_short']
             })
 
-    return jsonify({'slots': slots})
+    return {
+        'slots': slots,
+        'from': window_start.isoformat(),
+        'to': (window_end - timedelta(days=1)).isoformat()
+    }, complete
+
+@app.route('/api/slots/hold', methods=['POST'])
+def hold_slot():
+    """Reserve a slot for SLOT_HOLD_MINUTES while the visitor fills in the booking form.
+
+    Send back the returned `hold_token` (as `holdToken`) when booking. Passing an existing
+    token moves that hold to the new slot, so a token only ever holds one slot; each client
+    address may hold at most SLOT_HOLD_MAX_PER_CLIENT slots (429 beyond that).
+    """
+    data = request.get_json(silent=True) or {}
+    hold_token = data.get('hold_token') or str(uuid.uuid4())
+    slot_value = data.get('datetime')
+    try:
+        if not isinstance(slot_value, str):
+            raise ValueError(slot_value)
+        slot_datetime = schedule.to_local(datetime.fromisoformat(slot_value))
+    except ValueError:
+        return jsonify({"message": "A valid slot datetime is required."}), 400
+    if not schedule.is_slot(slot_datetime):
+        return jsonify({"message": "This time slot is no longer available. Please choose another time."}), 400
+
+    try:
+        slot_start, slot_end = schedule.meeting_interval(slot_datetime)
+        if load_conflicts(slot_start, slot_end, hold_token=hold_token).overlaps(slot_start, slot_end):
+            return jsonify({"message": "This time slot is no longer available. Please choose another time."}), 400
+
+        now = datetime.now(timezone.utc)
+        client_ip = request.remote_addr
+        other_holds = mongo.db.slot_holds.count_documents(
+            {"client_ip": client_ip, "token": {"$ne": hold_token}, "expires_at": {"$gt": now}})
+        if other_holds >= SLOT_HOLD_MAX_PER_CLIENT:
+            return jsonify({"message": "Too many time slots are being held from this address. Please try again in a few minutes."}), 429
+
+        # Claim the slot if it is free, its previous hold has lapsed, or it is already ours.
+        # If someone else holds it, the upsert collides with the unique slot index.
+        expires_at = now + timedelta(minutes=SLOT_HOLD_MINUTES)
+        try:
+            mongo.db.slot_holds.find_one_and_update(
+                {"meeting_datetime": slot_datetime, "$or": [{"expires_at": {"$lte": now}}, {"token": hold_token}]},
+                {"$set": {"token": hold_token, "client_ip": client_ip, "expires_at": expires_at, "created_at": now}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return jsonify({"message": "Someone else is booking this time slot right now. Please choose another time."}), 400
+
+        # A visitor switching slots releases the one they held before
+        released = list(mongo.db.slot_holds.find(
+            {"token": hold_token, "meeting_datetime": {"$ne": slot_datetime}}, {"meeting_datetime": 1}))
+        if released:
+            mongo.db.slot_holds.delete_many({"_id": {"$in": [hold['_id'] for hold in released]}})
+        for hold in released:
+            slots_changed(hold['meeting_datetime'])
+        slots_changed(slot_datetime)
+
+        return jsonify({
+            "hold_token": hold_token,
+            "datetime": slot_datetime.isoformat(),
+            "expires_at": expires_at.replace(tzinfo=None).isoformat() + 'Z',
+            "hold_seconds": SLOT_HOLD_MINUTES * 60
+        })
+    except Exception as e:
+        print(f"Slot hold failed: {e}")
+        return jsonify({"message": "Failed to hold this time slot. Please try again."}), 500
+
+
+@app.route('/api/slots/hold', methods=['DELETE'])
+def release_slot_hold():
+    data = request.get_json(silent=True) or {}
+    hold_token = data.get('hold_token')
+    if not hold_token:
+        return jsonify({"message": "hold_token is required."}), 400
+    try:
+        hold = mongo.db.slot_holds.find_one_and_delete({"token": hold_token})
+        if hold:
+            slots_changed(hold.get('meeting_datetime'))
+        return jsonify({"message": "Hold released.", "released": bool(hold)})
+    except Exception as e:
+        print(f"Releasing slot hold failed: {e}")
+        return jsonify({"message": "Failed to release hold."}), 500
+
 
 @app.route('/book-meeting', methods=['POST'])
 def book_meeting():
@@ -366,70 +782,72 @@ def book_meeting():
     budget = data.get('budget')
     message = data.get('message')
     datetime_str = data.get('datetime')
+    hold_token = data.get('holdToken')
     print(f"DEBUG: Extracted values - name={name}, email={email}, phone={phone}, company={company}, company_url={company_url}, project_type={project_type}, budget={budget}, message={message[:50] if message else None}, datetime={datetime_str}")
     
     try:
-        meeting_datetime = datetime.fromisoformat(datetime_str)
-        
-        # Check if slot is still available
-        existing_meeting = mongo.db.meetings.find_one({"meeting_datetime": meeting_datetime})
-        if existing_meeting:
+        # Clients may send either the slot's local `datetime` or its UTC instant
+        meeting_datetime = schedule.to_local(datetime.fromisoformat(datetime_str))
+        if not schedule.is_slot(meeting_datetime):
+            return jsonify({"message": "This time slot is no longer available. Please choose another time."}), 400
+        meeting_start, meeting_end = schedule.meeting_interval(meeting_datetime)
+        if load_conflicts(meeting_start, meeting_end, hold_token=hold_token).overlaps(meeting_start, meeting_end):
             return jsonify({"message": "This time slot is no longer available. Please choose another time."}), 400
         
-        # Save meeting request to database with all fields
-        result = mongo.db.meetings.insert_one({
-            "name": name,
-            "email": email,
-            "phone": phone,
-            "company": company,
-            "company_url": company_url,
-            "project_type": project_type,
-            "budget": budget,
-            "message": message,
-            "meeting_datetime": meeting_datetime,
-            "timestamp": datetime.now(),
-            "meeting_link": "",  # Will be provided later by admin
-            "status": "pending"  # Status indicates waiting for meeting link
-        })
-        print(f"Meeting inserted with ID: {result.inserted_id}")
-        
-        # Send meeting request confirmation to the user and notify company/admin
-        email_result = { 'user': False, 'admin': False, 'errors': [] }
+        # Save meeting request to database with all fields. The unique slot index
+        # rejects the insert if another active meeting already holds this time.
         try:
+            meeting_doc = {
+                "name": name,
+                "email": email,
+                "phone": phone,
+                "company": company,
+                "company_url": company_url,
+                "project_type": project_type,
+                "budget": budget,
+                "message": message,
+                "meeting_datetime": meeting_datetime,
+                "duration": schedule.meeting_minutes,
+                "timestamp": datetime.now(),
+                "updated_at": datetime.now(timezone.utc),
+                "meeting_link": "",  # Will be provided later by admin
+                "status": "pending",  # Status indicates waiting for meeting link
+                "email_sent": False,
+                "email_sent_user": False,
+                "email_sent_admin": False
+            }
+            result = mongo.db.meetings.insert_one(meeting_doc)
+        except DuplicateKeyError:
+            return jsonify({"message": "This time slot is no longer available. Please choose another time."}), 400
+        print(f"Meeting inserted with ID: {result.inserted_id}")
+        if hold_token:
+            # Consume the visitor's hold only once the booking exists, so a failed insert keeps it;
+            # a lapsed hold is fine as long as nobody else took the slot
             try:
-                send_meeting_request_confirmation_email(mail, name, email, phone, company, company_url, project_type, budget, message, meeting_datetime)
-                email_result['user'] = True
-            except Exception as e:
-                print(f"Email sending to user failed: {e}")
-                import traceback; traceback.print_exc()
-                email_result['errors'].append(str(e))
-
-            try:
-                # Notify the company/admin
-                send_meeting_request_email(mail, name, email, phone, company, company_url, project_type, budget, message, meeting_datetime)
-                email_result['admin'] = True
+                mongo.db.slot_holds.delete_one({"token": hold_token, "meeting_datetime": meeting_datetime})
             except Exception as e:
-                print(f"Email sending to admin failed: {e}")
-                import traceback; traceback.print_exc()
-                email_result['errors'].append(str(e))
+                print(f"Failed to release slot hold after booking: {e}")
+        # Bookkeeping only; the meeting is saved either way
+        try:
+            counters.changed('meetings', 1)
+            stats.meeting_created(meeting_doc)
         except Exception as e:
-            # Fallback generic log if something unexpected happens
-            print(f"Unexpected error sending meeting emails: {e}")
+            print(f"Failed to update meeting counters: {e}")
+        slots_changed(meeting_datetime)
         
-        # Persist the email sent flags on the meeting record for debugging/tracking
-        email_sent = bool(email_result.get('user') or email_result.get('admin'))
+        # Queue the confirmation to the user and the notice to the company/admin;
+        # the outbox worker records email_sent_user / email_sent_admin on delivery
+        record = ('meetings', result.inserted_id)
         try:
-            mongo.db.meetings.update_one({'_id': result.inserted_id}, {
-                '$set': {
-                    'email_sent': email_sent,
-                    'email_sent_user': bool(email_result.get('user')),
-                    'email_sent_admin': bool(email_result.get('admin'))
-                }
-            })
-            print(f"Updated meeting record {result.inserted_id} with email_sent_user={email_result.get('user')}, email_sent_admin={email_result.get('admin')}")
+            outbox.enqueue(meeting_request_confirmation_email(name, email, phone, company, company_url, project_type, budget, message, meeting_datetime, schedule.meeting_minutes), 'user', record)
         except Exception as e:
-            print(f"Failed to update meeting record with email flags: {e}")
-        print(f"Booking email_result: {email_result}")
+            print(f"Failed to queue meeting confirmation to user: {e}")
+            traceback.print_exc()
+        try:
+            outbox.enqueue(meeting_request_email(name, email, phone, company, company_url, project_type, budget, message, meeting_datetime, schedule.meeting_minutes), 'admin', record)
+        except Exception as e:
+            print(f"Failed to queue meeting request to admin: {e}")
+            traceback.print_exc()
 
         return jsonify({
             "message": "Meeting request submitted successfully! We will contact you soon with the meeting link.",
@@ -556,61 +974,7 @@ def admin():
     # Serve the React app for the /admin path so the SPA can handle routing
     # If the request contains `?json=1` or `Accept: application/json`, we return JSON data instead
     if request.args.get('json') == '1' or request.headers.get('Accept', '').lower().startswith('application/json'):
-        page = request.args.get('page', 1, type=int)
-        per_page = 10
-        search = request.args.get('search', '')
-        query = {}
-        if search:
-            query = {
-                "$or": [
-                    {"name": {"$regex": search, "$options": "i"}},
-                    {"email": {"$regex": search, "$options": "i"}},
-                    {"message": {"$regex": search, "$options": "i"}}
-                ]
-            }
-
-        contacts_cursor = mongo.db.contacts.find(query).skip((page-1)*per_page).limit(per_page)
-        contacts = []
-        for contact in contacts_cursor:
-            contacts.append({
-                'id': str(contact.get('_id')),
-                'name': contact.get('name'),
-                'email': contact.get('email'),
-                'message': contact.get('message'),
-                'timestamp': contact.get('timestamp').isoformat() if contact.get('timestamp') else None
-            })
-        total_contacts = mongo.db.contacts.count_documents(query)
-        contacts_pagination = {
-            'page': page,
-            'per_page': per_page,
-            'total': total_contacts
-        }
-
-        meetings_page = request.args.get('meetings_page', 1, type=int)
-        meetings_cursor = mongo.db.meetings.find().sort("meeting_datetime", -1).skip((meetings_page-1)*per_page).limit(per_page)
-        meetings = []
-        for meeting in meetings_cursor:
-            meetings.append({
-                'id': str(meeting.get('_id')),
-                'name': meeting.get('name'),
-                'email': meeting.get('email'),
-                'meeting_datetime': meeting.get('meeting_datetime').isoformat() if meeting.get('meeting_datetime') else None,
-                'status': meeting.get('status', 'pending'),
-                'meeting_link': meeting.get('meeting_link', '')
-            })
-        total_meetings = mongo.db.meetings.count_documents({})
-        meetings_pagination = {
-            'page': meetings_page,
-            'per_page': per_page,
-            'total': total_meetings
-        }
-
-        return jsonify({
-            'contacts': contacts,
-            'meetings': meetings,
-            'contacts_pagination': contacts_pagination,
-            'meetings_pagination': meetings_pagination
-        })
+        return api_admin()
 
     # Default behavior: serve React's index.html so that the SPA handles the admin page
     return render_template('index.html')
@@ -620,123 +984,120 @@ def admin():
 @login_required
 def api_admin():
     """Return admin data as JSON for SPA consumption."""
-    page = request.args.get('page', 1, type=int)
-    per_page = 10
-    search = request.args.get('search', '')
-    query = {}
-    if search:
-        query = {
-            "$or": [
-                {"name": {"$regex": search, "$options": "i"}},
-                {"email": {"$regex": search, "$options": "i"}},
-                {"message": {"$regex": search, "$options": "i"}}
-            ]
-        }
+    try:
+        return jsonify(dashboard.load(
+            page=request.args.get('page', 1, type=int),
+            search=request.args.get('search', ''),
+            meetings_page=request.args.get('meetings_page', 1, type=int),
+            cursor=request.args.get('cursor'),
+            meetings_cursor=request.args.get('meetings_cursor')
+        ))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+
+def export_response(dataset, default_format):
+    """Stream an export of `dataset` shaped by the request's query params.
+
+    format=csv|ndjson|parquet, fields=a,b,c, from/to=YYYY-MM-DD (inclusive, on the
+    dataset's date field), status=a,b (meetings), gzip=1 to compress on the fly.
+    """
+    try:
+        start = datetime.fromisoformat(request.args['from']).date() if request.args.get('from') else None
+        end = datetime.fromisoformat(request.args['to']).date() if request.args.get('to') else None
+    except ValueError:
+        return jsonify({'message': 'Invalid date range. Use YYYY-MM-DD for from/to.'}), 400
+    statuses = [status.strip() for status in request.args.get('status', '').split(',') if status.strip()]
+    try:
+        body, mimetype, extension = export_stream(
+            mongo.db[dataset.name], dataset,
+            request.args.get('format', default_format).lower(),
+            fields=request.args.get('fields'),
+            start=start, end=end, statuses=statuses
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    except ExportUnavailable as e:
+        return jsonify({'message': str(e)}), 501
+
+    filename = f'{dataset.name}.{extension}'
+    if request.args.get('gzip', '').lower() in ('1', 'true', 'yes'):
+        body = gzip_chunks(body)
+        mimetype = 'application/gzip'
+        filename += '.gz'
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
-    contacts_cursor = mongo.db.contacts.find(query).skip((page-1)*per_page).limit(per_page)
-    contacts = []
-    for contact in contacts_cursor:
-        contacts.append({
-            'id': str(contact.get('_id')),
-            'name': contact.get('name'),
-            'email': contact.get('email'),
-            'message': contact.get('message'),
-            'timestamp': contact.get('timestamp').isoformat() if contact.get('timestamp') else None
-        })
-    total_contacts = mongo.db.contacts.count_documents(query)
-    contacts_pagination = {
-        'page': page,
-        'per_page': per_page,
-        'total': total_contacts
-    }
 
-    meetings_page = request.args.get('meetings_page', 1, type=int)
-    meetings_cursor = mongo.db.meetings.find().sort("meeting_datetime", -1).skip((meetings_page-1)*per_page).limit(per_page)
-    meetings = []
-    for meeting in meetings_cursor:
-        meetings.append({
-            'id': str(meeting.get('_id')),
-            'name': meeting.get('name'),
-            'email': meeting.get('email'),
-            'meeting_datetime': meeting.get('meeting_datetime').isoformat() if meeting.get('meeting_datetime') else None,
-            'status': meeting.get('status', 'pending'),
-            'meeting_link': meeting.get('meeting_link', '')
-        })
-    total_meetings = mongo.db.meetings.count_documents({})
-    meetings_pagination = {
-        'page': meetings_page,
-        'per_page': per_page,
-        'total': total_meetings
-    }
+@app.route('/api/admin/stats')
+@login_required
+def api_admin_stats():
+    """Leads, bookings, status/budget/project type breakdowns and email delivery for a date range.
 
-    return jsonify({
-        'contacts': contacts,
-        'meetings': meetings,
-        'contacts_pagination': contacts_pagination,
-        'meetings_pagination': meetings_pagination
-    })
+    Reads only the stats_daily rollup. `from`/`to` are YYYY-MM-DD (inclusive); the default is the last 30 days.
+    """
+    try:
+        end = datetime.fromisoformat(request.args['to']).date() if request.args.get('to') else datetime.now().date()
+        start = datetime.fromisoformat(request.args['from']).date() if request.args.get('from') else end - timedelta(days=29)
+    except ValueError:
+        return jsonify({'message': 'Invalid date range. Use YYYY-MM-DD for from/to.'}), 400
+    if start > end:
+        return jsonify({'message': 'Invalid date range. from must not be after to.'}), 400
+    try:
+        return jsonify(stats.summary(start, end))
+    except Exception as e:
+        print(f"Failed to load stats: {e}")
+        return jsonify({'message': 'Failed to load stats.'}), 500
 
 
 @app.route('/admin/download/contacts')
 @login_required
 def download_contacts():
-    # Get all contacts
-    contacts = list(mongo.db.contacts.find())
-    
-    # Create CSV
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow(['Name', 'Email', 'Message', 'Timestamp', 'Email Sent'])
-    
-    # Write data
-    for contact in contacts:
-        writer.writerow([
-            contact.get('name', ''),
-            contact.get('email', ''),
-            contact.get('message', ''),
-            contact.get('timestamp', '').strftime('%Y-%m-%d %H:%M:%S') if contact.get('timestamp') else '',
-            'Yes' if contact.get('email_sent', False) else 'No'
-        ])
-    
-    output.seek(0)
-    return Response(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': 'attachment; filename=contacts.csv'}
-    )
+    return export_response(CONTACT_EXPORT, 'csv')
 
 
 @app.route('/admin/download/meetings')
 @login_required
 def download_meetings():
-    # Get all meetings
-    meetings = list(mongo.db.meetings.find())
-    
-    # Create CSV
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow(['Name', 'Email', 'Meeting DateTime', 'Status', 'Meeting Link'])
-    
-    # Write data
-    for meeting in meetings:
-        writer.writerow([
-            meeting.get('name', ''),
-            meeting.get('email', ''),
-            meeting.get('meeting_datetime', '').strftime('%Y-%m-%d %H:%M:%S') if meeting.get('meeting_datetime') else '',
-            meeting.get('status', 'pending'),
-            meeting.get('meeting_link', '')
-        ])
-    
-    output.seek(0)
-    return Response(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': 'attachment; filename=meetings.csv'}
-    )
+    return export_response(MEETING_EXPORT, 'csv')
+
+
+@app.route('/admin/export/<dataset>')
+@login_required
+def export_dataset(dataset):
+    """NDJSON by default; see export_response for the parameters."""
+    if dataset not in EXPORT_DATASETS:
+        return jsonify({'message': 'Unknown export. Use contacts or meetings.'}), 404
+    return export_response(EXPORT_DATASETS[dataset], 'ndjson')
+
+
+@app.route('/admin/export/<dataset>/changes')
+@login_required
+def export_changes(dataset):
+    """Records created, modified or deleted after `since` (a watermark from the previous call).
+
+    Omit `since` for a full initial sync. Call again with the returned watermark
+    while `has_more` is true. Optional: limit (default 1000), fields.
+    """
+    if dataset not in EXPORT_DATASETS:
+        return jsonify({'message': 'Unknown export. Use contacts or meetings.'}), 404
+    try:
+        page = delta_page(
+            mongo.db[dataset], EXPORT_DATASETS[dataset],
+            fields=request.args.get('fields'),
+            since=request.args.get('since'),
+            limit=request.args.get('limit', 1000, type=int),
+            tombstones=mongo.db[EXPORT_TOMBSTONES]
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        print(f"Failed to export {dataset} changes: {e}")
+        return jsonify({'message': 'Failed to export changes.'}), 500
+    return Response(json.dumps(page, default=json_default), mimetype='application/json')
 
 @app.route('/admin/meeting/<meeting_id>/provide-link', methods=['POST'])
 @login_required
@@ -755,70 +1116,31 @@ def provide_meeting_link(meeting_id):
         # Update meeting with link and change status
         mongo.db.meetings.update_one(
             {"_id": ObjectId(meeting_id)},
-            {"$set": {"meeting_link": meeting_link, "status": "scheduled"}}
-        )
-        
-        # Send confirmation email to client
-        send_meeting_email(
-            mail, 
-            meeting.get('name'), 
-            meeting.get('email'),
-            meeting.get('phone'),
-            meeting.get('company'),
-            meeting.get('company_url'),
-            meeting.get('project_type'),
-            meeting.get('budget'),
-            meeting.get('message'),
-            meeting.get('meeting_datetime'), 
-            meeting_link
+            {"$set": {"meeting_link": meeting_link, "status": "scheduled", "updated_at": datetime.now(timezone.utc)}}
         )
+        reminders.meeting_changed(dict(meeting, meeting_link=meeting_link, status="scheduled"))
+        stats.meeting_status_changed(meeting, "scheduled")
         
-        # Also send notification to admin that the link has been provided
-        admin_msg = Message('Meeting Link Provided - Aidaddy',
-                           recipients=[os.getenv('MAIL_USERNAME')])
-        admin_msg.body = f"""Meeting link has been provided for the following meeting:
-
-    Client: {meeting.get('name')} ({meeting.get('email')})
-    Date & Time: {meeting.get('meeting_datetime').strftime('%A, %B %d, %Y at %I:%M %p') if meeting.get('meeting_datetime') else ''}
-    Meeting Link: {meeting_link}
-
-    The client has been notified via email."""
-        
-        admin_msg.html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #10b981, #059669); color: white; padding: 20px; text-align: center; border-radius: 5px 5px 0 0; }}
-                .content {{ background-color: #f9f9f9; padding: 20px; border-radius: 0 0 5px 5px; }}
-                .meeting-info {{ background: white; padding: 15px; border-radius: 5px; border-left: 4px solid #10b981; margin: 15px 0; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h2>✅ Meeting Link Provided</h2>
-                </div>
-                <div class="content">
-                    <p>A meeting link has been provided and the client has been notified.</p>
-                    
-                    <div class="meeting-info">
-                        <h3>📋 Meeting Details</h3>
-                        <p><strong>Client:</strong> {meeting.get('name')} ({meeting.get('email')})</p>
-                        <p><strong>Date & Time:</strong> {meeting.get('meeting_datetime').strftime('%A, %B %d, %Y at %I:%M %p') if meeting.get('meeting_datetime') else ''}</p>
-                        <p><strong>Meeting Link:</strong> <a href="{meeting_link}" target="_blank">{meeting_link}</a></p>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
+        # Queue the confirmation to the client and the company copy, plus a notice
+        # to the company that the link went out
         try:
-            mail.send(admin_msg)
+            outbox.enqueue_all(meeting_scheduled_emails(
+                meeting.get('name'),
+                meeting.get('email'),
+                meeting.get('phone'),
+                meeting.get('company'),
+                meeting.get('company_url'),
+                meeting.get('project_type'),
+                meeting.get('budget'),
+                meeting.get('message'),
+                meeting.get('meeting_datetime'),
+                meeting_link,
+                meeting.get('duration') or schedule.meeting_minutes
+            ), record=('meetings', meeting['_id']))
+            outbox.enqueue(meeting_link_admin_email(meeting.get('name'), meeting.get('email'), meeting.get('meeting_datetime'), meeting_link), 'admin')
         except Exception as e:
-            print(f"Failed to send admin notification: {e}")
+            print(f"Failed to queue meeting link emails: {e}")
+            traceback.print_exc()
         
         return jsonify({"message": "Meeting link provided successfully! Client has been notified."})
     
@@ -836,47 +1158,55 @@ def reschedule_meeting(meeting_id):
         return jsonify({"message": "New date and time are required."}), 400
     
     try:
-        meeting = mongo.db.meetings.find_one({"_id": ObjectId(meeting_id)})
-        if not meeting:
+        new_datetime = schedule.to_local(datetime.fromisoformat(new_datetime_str))
+        current = mongo.db.meetings.find_one({"_id": ObjectId(meeting_id)}, {"duration": 1})
+        if not current:
             return jsonify({"message": "Meeting not found."}), 404
-        new_datetime = datetime.fromisoformat(new_datetime_str)
         
-        # Check if the new slot is available
-        existing_meeting = mongo.db.meetings.find_one({
-            "meeting_datetime": new_datetime,
-            "_id": {"$ne": ObjectId(meeting_id)}
-        })
-        
-        if existing_meeting:
+        # Reject moves that overlap another active meeting (not just an exact start match),
+        # using this meeting's own length
+        new_start, new_end = schedule.meeting_interval(new_datetime, current.get('duration'))
+        conflicts = load_conflicts(new_start, new_end, exclude_id=ObjectId(meeting_id), include_holds=False)
+        if conflicts.overlaps(new_start, new_end):
             return jsonify({"message": "This time slot is already booked. Please choose another time."}), 400
-        
-        old_datetime = meeting.get('meeting_datetime')
-        updated_meeting = mongo.db.meetings.find_one_and_update(
-            {"_id": ObjectId(meeting_id)},
-            {"$set": {"meeting_datetime": new_datetime}},
-            return_document=ReturnDocument.AFTER
-        )
 
-        if not updated_meeting:
-            print("Reschedule: update did not return updated document")
-            return jsonify({"message": "Failed to reschedule meeting. Meeting not updated."}), 500
+        # Single conditional write: the unique slot index rejects the move if another
+        # active meeting claimed the same start meanwhile. The pre-update document gives us the old slot.
+        try:
+            meeting = mongo.db.meetings.find_one_and_update(
+                {"_id": ObjectId(meeting_id)},
+                {"$set": {"meeting_datetime": new_datetime, "updated_at": datetime.now(timezone.utc)}},
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            return jsonify({"message": "This time slot is already booked. Please choose another time."}), 400
+
+        if not meeting:
+            return jsonify({"message": "Meeting not found."}), 404
+
+        old_datetime = meeting.get('meeting_datetime')
+        updated_meeting = dict(meeting, meeting_datetime=new_datetime)
 
         print(f"Reschedule: meeting {meeting_id} updated from {old_datetime} to {new_datetime}")
+        slots_changed(old_datetime, meeting.get('duration'))
+        slots_changed(new_datetime, meeting.get('duration'))
+        reminders.meeting_changed(updated_meeting)
         
-        # Attempt to send reschedule notification emails (user + admin)
+        # Queue reschedule notification emails (user + admin)
+        email_result = {'queued': []}
         try:
-            # Log email settings (not secrets) to aid debugging
-            print('mail config - MAIL_USERNAME:', app.config.get('MAIL_USERNAME'), 'MAIL_DEFAULT_SENDER:', app.config.get('MAIL_DEFAULT_SENDER'))
-            email_result = send_meeting_reschedule_email(mail, updated_meeting.get('name'), updated_meeting.get('email'), old_datetime, new_datetime, updated_meeting.get('meeting_link', ''))
-            print(f"Reschedule: email_result: {email_result}")
+            queued = outbox.enqueue_all(meeting_reschedule_emails(updated_meeting.get('name'), updated_meeting.get('email'), old_datetime, new_datetime, updated_meeting.get('meeting_link', '')),
+                                        record=('meetings', meeting['_id']))
+            email_result['queued'] = sorted(queued)
+            print(f"Reschedule: queued emails: {email_result['queued']}")
         except Exception as e:
-            print(f"Failed to send reschedule email notifications: {e}")
+            print(f"Failed to queue reschedule email notifications: {e}")
             traceback.print_exc()
 
         return jsonify({
             "message": f"Meeting rescheduled successfully from {old_datetime.strftime('%Y-%m-%d %H:%M') if old_datetime else 'N/A'} to {new_datetime.strftime('%Y-%m-%d %H:%M')}.", 
             "meeting": {"id": str(updated_meeting.get('_id')), "meeting_datetime": updated_meeting.get('meeting_datetime').isoformat() if updated_meeting.get('meeting_datetime') else None},
-            "email_result": email_result if 'email_result' in locals() else None
+            "email_result": email_result
         })
     
     except Exception as e:
@@ -892,8 +1222,10 @@ def complete_meeting(meeting_id):
             return jsonify({"message": "Meeting not found."}), 404
         mongo.db.meetings.update_one(
             {"_id": ObjectId(meeting_id)},
-            {"$set": {"status": "completed"}}
+            {"$set": {"status": "completed", "updated_at": datetime.now(timezone.utc)}}
         )
+        reminders.meeting_removed(meeting['_id'])
+        stats.meeting_status_changed(meeting, "completed")
         
         return jsonify({"message": "Meeting marked as completed successfully!"})
     
@@ -908,7 +1240,13 @@ def delete_meeting(meeting_id):
         meeting = mongo.db.meetings.find_one({"_id": ObjectId(meeting_id)})
         if not meeting:
             return jsonify({"message": "Meeting not found."}), 404
-        mongo.db.meetings.delete_one({"_id": ObjectId(meeting_id)})
+        deleted = mongo.db.meetings.delete_one({"_id": ObjectId(meeting_id)})
+        counters.changed('meetings', -deleted.deleted_count)
+        if deleted.deleted_count:
+            stats.meeting_deleted(meeting)
+            record_deleted(mongo.db, MEETING_EXPORT, [meeting['_id']])
+        slots_changed(meeting.get('meeting_datetime'), meeting.get('duration'))
+        reminders.meeting_removed(meeting['_id'])
         
         return jsonify({"message": "Meeting deleted successfully!"})
     
@@ -923,7 +1261,11 @@ def delete_contact(contact_id):
         contact = mongo.db.contacts.find_one({"_id": ObjectId(contact_id)})
         if not contact:
             return jsonify({"message": "Contact not found."}), 404
-        mongo.db.contacts.delete_one({"_id": ObjectId(contact_id)})
+        deleted = mongo.db.contacts.delete_one({"_id": ObjectId(contact_id)})
+        counters.changed('contacts', -deleted.deleted_count)
+        if deleted.deleted_count:
+            stats.contact_deleted(contact)
+            record_deleted(mongo.db, CONTACT_EXPORT, [contact['_id']])
         
         return jsonify({"message": "Contact deleted successfully!"})
     
@@ -932,6 +1274,177 @@ def delete_contact(contact_id):
         return jsonify({"message": "Failed to delete contact. Please try again."}), 500
 
 
+# Most ids accepted by one bulk request
+BULK_MAX_IDS = 500
+
+
+def parse_bulk_ids(data):
+    """Split the request's `ids` into ObjectIds to act on and per-id results for the invalid ones.
+
+    Returns (ids in request order without duplicates, {id: ObjectId}, {id: result}).
+    """
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        raise ValueError("ids must be a non-empty list.")
+    if len(ids) > BULK_MAX_IDS:
+        raise ValueError(f"At most {BULK_MAX_IDS} ids per request.")
+    order = list(dict.fromkeys(str(i) for i in ids))
+    object_ids, results = {}, {}
+    for raw_id in order:
+        try:
+            object_ids[raw_id] = ObjectId(raw_id)
+        except Exception:
+            results[raw_id] = {'id': raw_id, 'ok': False, 'error': 'invalid id'}
+    return order, object_ids, results
+
+
+def run_bulk(collection, object_ids, results, make_op, projection, check=None):
+    """Apply one write per existing document with a single unordered bulk_write.
+
+    `make_op(doc)` returns the write for a document. Looks the documents up first with one
+    `$in` query (for not-found results and side effects) and returns the documents whose
+    write succeeded and the number of documents actually deleted. An optional `check(doc)`
+    returns an error string for documents that must not be written.
+    """
+    docs = {doc['_id']: doc for doc in collection.find({'_id': {'$in': list(object_ids.values())}}, projection)}
+    targets = []
+    for raw_id, object_id in object_ids.items():
+        error = 'not found' if object_id not in docs else check(docs[object_id]) if check else None
+        if error:
+            results[raw_id] = {'id': raw_id, 'ok': False, 'error': error}
+        else:
+            targets.append((raw_id, docs[object_id]))
+    if not targets:
+        return [], 0
+
+    failed = {}
+    try:
+        deleted = collection.bulk_write([make_op(doc) for _, doc in targets], ordered=False).deleted_count
+    except BulkWriteError as e:
+        deleted = e.details.get('nRemoved', 0)
+        for error in e.details.get('writeErrors', []):
+            failed[error['index']] = 'slot already taken' if error.get('code') == 11000 else error.get('errmsg', 'write failed')
+    done = []
+    for index, (raw_id, doc) in enumerate(targets):
+        if index in failed:
+            results[raw_id] = {'id': raw_id, 'ok': False, 'error': failed[index]}
+        else:
+            results[raw_id] = {'id': raw_id, 'ok': True}
+            done.append(doc)
+    return done, deleted
+
+
+def bulk_response(action, order, results):
+    ordered = [results[raw_id] for raw_id in order]
+    succeeded = sum(1 for result in ordered if result['ok'])
+    return jsonify({
+        "message": f"{action}: {succeeded} succeeded, {len(ordered) - succeeded} failed.",
+        "succeeded": succeeded,
+        "failed": len(ordered) - succeeded,
+        "results": ordered
+    })
+
+
+@app.route('/admin/meetings/bulk', methods=['POST'])
+@login_required
+def bulk_meetings():
+    """Apply one action to many meetings.
+
+    Body: {"ids": [...], "action": "complete" | "delete" | "set-status", "status": "..." (set-status)}
+    Meetings that would become active over another active meeting, or be scheduled
+    without a meeting link, are reported as failed and left unchanged.
+    """
+    data = request.json or {}
+    action = data.get('action')
+    if action not in ('complete', 'delete', 'set-status'):
+        return jsonify({"message": "action must be complete, delete or set-status."}), 400
+    status = 'completed' if action == 'complete' else data.get('status')
+    if action == 'set-status' and status not in MEETING_STATUSES:
+        return jsonify({"message": f"status must be one of: {', '.join(MEETING_STATUSES)}."}), 400
+    try:
+        order, object_ids, results = parse_bulk_ids(data)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # Intervals of the meetings this request reactivates, so they can't overlap each other either
+    reactivated = []
+
+    def check_status_change(doc):
+        if status == 'scheduled' and not doc.get('meeting_link'):
+            # Reminders for a scheduled meeting carry its link; use provide-link instead
+            return 'meeting link required'
+        if status not in ACTIVE_MEETING_STATUSES or doc.get('status', 'pending') in ACTIVE_MEETING_STATUSES:
+            return None
+        if not doc.get('meeting_datetime'):
+            return None
+        start, end = schedule.meeting_interval(doc['meeting_datetime'], doc.get('duration'))
+        conflicts = load_conflicts(start, end, exclude_id=doc['_id'], include_holds=False)
+        if conflicts.overlaps(start, end) or ConflictIndex(reactivated).overlaps(start, end):
+            return 'slot already taken'
+        reactivated.append((start, end))
+        return None
+
+    try:
+        now = datetime.now(timezone.utc)
+        if action == 'delete':
+            make_op = lambda doc: DeleteOne({'_id': doc['_id']})
+        else:
+            make_op = lambda doc: UpdateOne({'_id': doc['_id']}, {'$set': {'status': status, 'updated_at': now}})
+        done, deleted = run_bulk(
+            mongo.db.meetings, object_ids, results, make_op,
+            {'meeting_datetime': 1, 'duration': 1, 'status': 1, 'reminders_sent': 1,
+             'timestamp': 1, 'budget': 1, 'project_type': 1, 'meeting_link': 1},
+            check=None if action == 'delete' else check_status_change
+        )
+    except Exception as e:
+        print(f"Failed to run bulk meeting {action}: {e}")
+        return jsonify({"message": "Failed to update meetings. Please try again."}), 500
+
+    # Side effects of the single-meeting routes, for the meetings that were written
+    now_active = action != 'delete' and status in ACTIVE_MEETING_STATUSES
+    for meeting in done:
+        if action == 'delete':
+            reminders.meeting_removed(meeting['_id'])
+            stats.meeting_deleted(meeting)
+        else:
+            reminders.meeting_changed(dict(meeting, status=status))
+            stats.meeting_status_changed(meeting, status)
+        if (meeting.get('status', 'pending') in ACTIVE_MEETING_STATUSES) != now_active:
+            slots_changed(meeting.get('meeting_datetime'), meeting.get('duration'))
+    counters.changed('meetings', -deleted)
+    if action == 'delete':
+        record_deleted(mongo.db, MEETING_EXPORT, [meeting['_id'] for meeting in done])
+
+    return bulk_response(action, order, results)
+
+
+@app.route('/admin/contacts/bulk', methods=['POST'])
+@login_required
+def bulk_contacts():
+    """Apply one action to many contacts. Body: {"ids": [...], "action": "delete"}"""
+    data = request.json or {}
+    action = data.get('action')
+    if action != 'delete':
+        return jsonify({"message": "action must be delete."}), 400
+    try:
+        order, object_ids, results = parse_bulk_ids(data)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    try:
+        done, deleted = run_bulk(mongo.db.contacts, object_ids, results, lambda doc: DeleteOne({'_id': doc['_id']}),
+                                 {'timestamp': 1})
+    except Exception as e:
+        print(f"Failed to run bulk contact {action}: {e}")
+        return jsonify({"message": "Failed to update contacts. Please try again."}), 500
+    counters.changed('contacts', -deleted)
+    for contact in done:
+        stats.contact_deleted(contact)
+    record_deleted(mongo.db, CONTACT_EXPORT, [contact['_id'] for contact in done])
+
+    return bulk_response(action, order, results)
+
+
 @app.route('/debug/email-test', methods=['POST'])
 def debug_email_test():
     # Basic endpoint to test email delivery; requires JSON: { "to": "email@address" }
@@ -981,6 +1494,7 @@ def debug_update_meeting_email_flags():
         if admin_flag is not None:
             update['email_sent_admin'] = admin_flag
         if update:
+            update['updated_at'] = datetime.now(timezone.utc)
             mongo.db.meetings.update_one({ '_id': ObjectId(id) }, { '$set': update })
             return jsonify({ 'message': 'Updated', 'id': id, 'updated': update })
         return jsonify({ 'message': 'No flags provided' }), 400
@@ -1051,6 +1565,83 @@ def slugify(text):
     text = re.sub(r'[-\s]+', '-', text)
     return text
 
+def notify_subscribers(blog):
+    # Queue the newsletter for a freshly published post; never fails the blog write
+    try:
+        newsletter.publish(blog, production_url or request.host_url)
+    except Exception as e:
+        print(f"Failed to start newsletter for blog {blog.id}: {e}")
+        traceback.print_exc()
+
+@app.route('/api/newsletter/subscribe', methods=['POST'])
+def newsletter_subscribe():
+    data = request.json or {}
+    email = (data.get('email') or '').strip()
+    if '@' not in email:
+        return jsonify({"message": "A valid email address is required."}), 400
+    try:
+        newsletter.subscribe(email, (data.get('name') or '').strip())
+        return jsonify({"message": "Thanks for subscribing! You'll hear from us when we publish new posts."})
+    except Exception as e:
+        print(f"Newsletter subscribe failed: {e}")
+        return jsonify({"message": "Failed to subscribe. Please try again."}), 500
+
+@app.route('/api/newsletter/unsubscribe', methods=['GET', 'POST'])
+def newsletter_unsubscribe():
+    token = request.args.get('token') or (request.get_json(silent=True) or {}).get('token')
+    if not token:
+        return jsonify({"message": "Unsubscribe token is required."}), 400
+    try:
+        if not newsletter.unsubscribe(token):
+            return jsonify({"message": "Subscription not found."}), 404
+        return jsonify({"message": "You have been unsubscribed from the Aidaddy newsletter."})
+    except Exception as e:
+        print(f"Newsletter unsubscribe failed: {e}")
+        return jsonify({"message": "Failed to unsubscribe. Please try again."}), 500
+
+def trigger_authorized(token_env, header):
+    """A logged-in admin, or a scheduler sending the secret from `token_env` in `header`."""
+    trigger_token = os.getenv(token_env, '')
+    sent_token = request.headers.get(header, '')
+    return current_user.is_authenticated or bool(trigger_token and hmac.compare_digest(sent_token, trigger_token))
+
+@app.route('/api/admin/newsletter/send', methods=['POST'])
+def newsletter_send():
+    """Send the next few batches of a pending newsletter campaign.
+
+    This is how campaigns go out where no background sender runs (serverless); call it
+    repeatedly, e.g. from a scheduled function, until it reports nothing left. Admins may
+    call it logged in; a scheduler sends the NEWSLETTER_TRIGGER_TOKEN as X-Newsletter-Token.
+    """
+    if not trigger_authorized('NEWSLETTER_TRIGGER_TOKEN', 'X-Newsletter-Token'):
+        return jsonify({'message': 'Unauthorized', 'success': False}), 401
+    batches = request.args.get('batches', int(os.getenv('NEWSLETTER_TRIGGER_BATCHES', '2')), type=int)
+    try:
+        progress = newsletter.send_due(max_batches=min(max(batches, 1), 20))
+    except Exception as e:
+        print(f"Newsletter send failed: {e}")
+        return jsonify({"message": "Failed to send newsletter batches."}), 500
+    if progress is None:
+        return jsonify({"message": "No newsletter campaign is waiting to be sent.", "campaign": None})
+    return jsonify({"message": f"Newsletter campaign is {progress['status']}.", "campaign": progress})
+
+@app.route('/api/admin/outbox/send', methods=['POST'])
+def outbox_send():
+    """Retry queued emails that are due.
+
+    With the inline outbox (serverless) a failed email is otherwise never retried; call this
+    on a schedule with OUTBOX_TRIGGER_TOKEN as X-Outbox-Token, or logged in as an admin.
+    """
+    if not trigger_authorized('OUTBOX_TRIGGER_TOKEN', 'X-Outbox-Token'):
+        return jsonify({'message': 'Unauthorized', 'success': False}), 401
+    limit = request.args.get('limit', 50, type=int)
+    try:
+        attempted = outbox.send_due(max_messages=min(max(limit, 1), 200))
+    except Exception as e:
+        print(f"Outbox send failed: {e}")
+        return jsonify({"message": "Failed to send queued emails."}), 500
+    return jsonify({"message": f"Attempted {attempted} queued email(s).", "attempted": attempted})
+
 # Get all blogs (public + admin)
 @app.route('/api/blogs', methods=['GET'])
 def get_blogs():
@@ -1061,7 +1652,8 @@ def get_blogs():
         topic_id = request.args.get('topic_id', None)
         search = request.args.get('search', '')
         
-        query = Blog.query
+        # The listing never returns content, so don't load it
+        query = Blog.query.options(db.defer(Blog.content))
         
         # Filter by status (only published for public, all for admin)
         if status:
@@ -1071,20 +1663,24 @@ def get_blogs():
         if topic_id:
             query = query.filter_by(topic_id=topic_id)
         
-        # Search in title and content
-        if search:
+        # Search in title, excerpt and content: ranked full-text search where available
+        matches = blog_search.matches(search) if search and blog_search.enabled else None
+        if matches is not None:
+            query = query.join(matches, Blog.id == matches.c.blog_id).order_by(matches.c.rank, Blog.published_at.desc())
+        elif search:
             query = query.filter(
                 db.or_(
                     Blog.title.ilike(f'%{search}%'),
                     Blog.content.ilike(f'%{search}%')
                 )
-            )
-        
-        # Order by publish date
-        query = query.order_by(Blog.published_at.desc())
+            ).order_by(Blog.published_at.desc())
+        else:
+            # Order by publish date
+            query = query.order_by(Blog.published_at.desc())
         
         # Paginate
         paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+        snippets = blog_search.snippets(search, [blog.id for blog in paginated.items]) if matches is not None else {}
         
         blogs = [{
             'id': blog.id,
@@ -1100,7 +1696,9 @@ def get_blogs():
             'subtopic_id': blog.subtopic_id,
             'subtopic_name': blog.subtopic_id,
             'created_at': blog.created_at.isoformat() if blog.created_at else None,
-            'published_at': blog.published_at.isoformat() if blog.published_at else None
+            'published_at': blog.published_at.isoformat() if blog.published_at else None,
+            # Highlighted match context (HTML with <mark>) when searching
+            'snippet': snippets.get(blog.id)
         } for blog in paginated.items]
         
         return jsonify({
@@ -1193,7 +1791,12 @@ def create_blog():
             blog.published_at = datetime.now()
         
         db.session.add(blog)
+        db.session.flush()
+        blog_search.index(blog)
         db.session.commit()
+
+        if blog.status == 'published':
+            notify_subscribers(blog)
         
         return jsonify({
             'success': True,
@@ -1244,14 +1847,21 @@ def update_blog(blog_id):
             blog.meta_keywords = data['meta_keywords']
         
         # Handle status change
+        newly_published = False
         if 'status' in data:
             old_status = blog.status
             blog.status = data['status']
             if blog.status == 'published' and old_status != 'published':
                 blog.published_at = datetime.now()
+                newly_published = True
         
         blog.updated_at = datetime.now()
+        if data.keys() & {'title', 'excerpt', 'content'}:
+            blog_search.index(blog)
         db.session.commit()
+
+        if newly_published:
+            notify_subscribers(blog)
         
         return jsonify({
             'success': True,
@@ -1271,6 +1881,7 @@ def delete_blog(blog_id):
         if not blog:
             return jsonify({'success': False, 'message': 'Blog not found'}), 404
         
+        blog_search.remove(blog.id)
         db.session.delete(blog)
         db.session.commit()
         
@@ -1362,6 +1973,7 @@ if __name__ == '__main__':
     with app.app_context():
         db.create_all()  # Create blog tables
         print("Blog database tables created successfully!")
+    start_background()
     # use_reloader=False is used to prevent [WinError 10038] on Windows
     app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
 
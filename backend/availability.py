@@ -0,0 +1,95 @@
+"""
+In-process availability cache for the public /api/available-slots endpoint.
+
+Rendered slot lists from the schedule are cached per date (the formatting
+never changes for a given day) and the serialized response is cached per
+requested window. Booking writes call `invalidate()` with the slot they
+touched, which drops only the windows that contain that date. A short TTL bounds staleness when several
+worker processes each hold their own copy, and at most `max_windows` windows are kept (least recently
+used go first) since `from`/`to` let clients ask for any number of distinct windows.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+
+class CachedWindow:
+    def __init__(self, body, etag, expires_at):
+        self.body = body
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+class AvailabilityCache:
+    def __init__(self, schedule, ttl=30, max_windows=256):
+        self.schedule = schedule
+        self.ttl = ttl
+        self.max_windows = max_windows
+        self._lock = threading.Lock()
+        self._days = {}
+        self._windows = OrderedDict()
+        self._today = None
+        # Bumped on every invalidation so a rebuild that raced a booking is not stored
+        self.generation = 0
+
+    def day_slots(self, day):
+        slots = self._days.get(day)
+        if slots is None:
+            slots = self.schedule.day_slots(day)
+            with self._lock:
+                self._days[day] = slots
+        self._evict_past_days()
+        return slots
+
+    def _evict_past_days(self):
+        # Past days are never requested again; prune once per date change
+        today = self.schedule.today()
+        if today == self._today:
+            return
+        with self._lock:
+            self._today = today
+            for old_day in [d for d in self._days if d < today - timedelta(days=1)]:
+                del self._days[old_day]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._windows[key]
+                return None
+            self._windows.move_to_end(key)
+            return entry
+
+    def put(self, key, payload, generation):
+        body = json.dumps(payload, separators=(',', ':'))
+        now = time.monotonic()
+        entry = CachedWindow(body, hashlib.sha1(body.encode('utf-8')).hexdigest(), now + self.ttl)
+        with self._lock:
+            if generation == self.generation:
+                for old_key in [k for k, e in self._windows.items() if e.expires_at <= now]:
+                    del self._windows[old_key]
+                self._windows[key] = entry
+                self._windows.move_to_end(key)
+                while len(self._windows) > self.max_windows:
+                    self._windows.popitem(last=False)
+        return entry
+
+    def invalidate(self, slot_datetime):
+        """Drop every cached window that contains `slot_datetime`'s date."""
+        if not slot_datetime:
+            return
+        day = slot_datetime.date()
+        with self._lock:
+            self.generation += 1
+            for key in [k for k in self._windows if k[0] <= day < k[1]]:
+                del self._windows[key]
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._windows.clear()
@@ -0,0 +1,218 @@
+"""
+Full-text search for blog posts.
+
+Posts are indexed in a side table holding the text of the title, excerpt and
+content, with the content's HTML stripped:
+
+* SQLite: `blog_fts`, an FTS5 table ranked with bm25() (title counts most,
+  then excerpt, then content). Snippets come from snippet().
+* PostgreSQL: `blog_search`, with a weighted tsvector column behind a GIN
+  index. Ranking uses ts_rank_cd() and snippets ts_headline(). Queries go
+  through websearch_to_tsquery().
+
+Other databases, or SQLite builds without FTS5, get `enabled = False` and
+the caller keeps its LIKE search.
+
+`setup()` runs at startup. The blog routes call `index()` / `remove()` in
+the same transaction as the post write, so the index commits or rolls back
+with it. Existing posts are
+indexed with `python rebuild_blog_search.py`.
+
+User input never reaches the query syntax. For FTS5, every term is quoted as
+a string and the last one is matched as a prefix; websearch_to_tsquery
+accepts any text. Snippets are HTML-escaped, with the matched terms wrapped
+in <mark>.
+"""
+import re
+from html import escape
+from html.parser import HTMLParser
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+# Highlight markers used inside the database, swapped for <mark> after escaping
+MARK_START = '\x02'
+MARK_END = '\x03'
+SNIPPET_WORDS = 24
+
+
+class _TextExtractor(HTMLParser):
+    SKIP = {'script', 'style'}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self._skipping += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP and self._skipping:
+            self._skipping -= 1
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+
+def html_text(html):
+    """Visible text of an HTML fragment, whitespace collapsed."""
+    parser = _TextExtractor()
+    parser.feed(html or '')
+    parser.close()
+    return re.sub(r'\s+', ' ', ' '.join(parser.parts)).strip()
+
+
+def fts5_query(search):
+    """A MATCH expression treating `search` as plain words (last one as a prefix)."""
+    terms = re.findall(r'\w+', search)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def highlight(snippet):
+    return escape(snippet or '').replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+class BlogSearch:
+    def __init__(self, db):
+        self.db = db
+        self._dialect = None
+
+    def setup(self):
+        """Create the index table if needed. Call at startup, outside any write transaction
+        (on SQLite the DDL would otherwise wait on the request's own write lock)."""
+        self._dialect = self._setup()
+        return self.enabled
+
+    @property
+    def dialect(self):
+        """'sqlite', 'postgresql', or None when full-text search is unavailable."""
+        if self._dialect is None:
+            self.setup()
+        return self._dialect or None
+
+    @property
+    def enabled(self):
+        return self.dialect is not None
+
+    def _setup(self):
+        name = self.db.engine.dialect.name
+        try:
+            with self.db.engine.begin() as connection:
+                if name == 'sqlite':
+                    connection.execute(text(
+                        "CREATE VIRTUAL TABLE IF NOT EXISTS blog_fts USING fts5("
+                        "blog_id UNINDEXED, title, excerpt, content, tokenize='porter unicode61')"
+                    ))
+                elif name == 'postgresql':
+                    connection.execute(text(
+                        "CREATE TABLE IF NOT EXISTS blog_search ("
+                        "blog_id VARCHAR(36) PRIMARY KEY, content TEXT NOT NULL, document TSVECTOR NOT NULL)"
+                    ))
+                    connection.execute(text(
+                        "CREATE INDEX IF NOT EXISTS blog_search_document_idx ON blog_search USING GIN (document)"
+                    ))
+                else:
+                    print(f"blog search: no full-text index for {name}; using LIKE search")
+                    return ''
+        except OperationalError as e:
+            print(f"blog search: full-text index unavailable ({e}); using LIKE search")
+            return ''
+        return name
+
+    # ------------------------------------------------------------------
+    # Keeping the index in sync (inside the caller's transaction)
+    # ------------------------------------------------------------------
+    def index(self, blog):
+        if not self.enabled:
+            return
+        params = {
+            'blog_id': blog.id,
+            'title': blog.title or '',
+            'excerpt': blog.excerpt or '',
+            'content': html_text(blog.content)
+        }
+        session = self.db.session
+        if self.dialect == 'sqlite':
+            session.execute(text("DELETE FROM blog_fts WHERE blog_id = :blog_id"), params)
+            session.execute(text(
+                "INSERT INTO blog_fts (blog_id, title, excerpt, content) VALUES (:blog_id, :title, :excerpt, :content)"
+            ), params)
+        else:
+            session.execute(text(
+                "INSERT INTO blog_search (blog_id, content, document) VALUES (:blog_id, :content, "
+                "setweight(to_tsvector('english', :title), 'A') || "
+                "setweight(to_tsvector('english', :excerpt), 'B') || "
+                "setweight(to_tsvector('english', :content), 'C')) "
+                "ON CONFLICT (blog_id) DO UPDATE SET content = EXCLUDED.content, document = EXCLUDED.document"
+            ), params)
+
+    def remove(self, blog_id):
+        if not self.enabled:
+            return
+        table = 'blog_fts' if self.dialect == 'sqlite' else 'blog_search'
+        self.db.session.execute(text(f"DELETE FROM {table} WHERE blog_id = :blog_id"), {'blog_id': blog_id})
+
+    def rebuild(self, blogs, batch_size=200):
+        """Re-index every post in `blogs` (an iterable of Blog rows); returns how many were indexed."""
+        if not self.enabled:
+            return 0
+        table = 'blog_fts' if self.dialect == 'sqlite' else 'blog_search'
+        self.db.session.execute(text(f"DELETE FROM {table}"))
+        count = 0
+        for blog in blogs:
+            self.index(blog)
+            count += 1
+            if count % batch_size == 0:
+                self.db.session.flush()
+        self.db.session.commit()
+        return count
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+    def matches(self, search):
+        """A subquery of (blog_id, rank) for posts matching `search`, lower rank = better; None if no terms."""
+        if self.dialect == 'sqlite':
+            match = fts5_query(search)
+            if match is None:
+                return None
+            # Weights: blog_id (unindexed), title, excerpt, content
+            statement = text(
+                "SELECT blog_id, bm25(blog_fts, 0.0, 10.0, 4.0, 1.0) AS rank FROM blog_fts WHERE blog_fts MATCH :match"
+            ).bindparams(match=match)
+        else:
+            if not search.strip():
+                return None
+            statement = text(
+                "SELECT blog_id, -ts_rank_cd(document, websearch_to_tsquery('english', :search)) AS rank "
+                "FROM blog_search WHERE document @@ websearch_to_tsquery('english', :search)"
+            ).bindparams(search=search)
+        return statement.columns(blog_id=self.db.String, rank=self.db.Float).subquery('matches')
+
+    def snippets(self, search, blog_ids):
+        """{blog_id: highlighted HTML snippet} for a page of results."""
+        if not blog_ids or not self.enabled:
+            return {}
+        ids = {f'id{i}': blog_id for i, blog_id in enumerate(blog_ids)}
+        placeholders = ', '.join(f':{key}' for key in ids)
+        if self.dialect == 'sqlite':
+            statement = text(
+                f"SELECT blog_id, snippet(blog_fts, -1, :start, :end, '…', {SNIPPET_WORDS}) FROM blog_fts "
+                f"WHERE blog_fts MATCH :match AND blog_id IN ({placeholders})"
+            )
+            params = dict(ids, start=MARK_START, end=MARK_END, match=fts5_query(search))
+        else:
+            statement = text(
+                "SELECT blog_id, ts_headline('english', content, websearch_to_tsquery('english', :search), :options) "
+                f"FROM blog_search WHERE blog_id IN ({placeholders})"
+            )
+            options = f'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords={SNIPPET_WORDS}, MinWords=10'
+            params = dict(ids, search=search, options=options)
+        return {row[0]: highlight(row[1]) for row in self.db.session.execute(statement, params)}
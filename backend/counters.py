@@ -0,0 +1,101 @@
+"""
+Row totals for the admin dashboard without counting a collection per request.
+
+* Unfiltered totals come from a maintained counter in the `counters`
+  collection (one document per collection, `{'_id': 'contacts', 'count': n}`).
+  The routes that insert or delete contacts and meetings call `changed()`
+  with the delta. The counter is seeded with one exact count the first time
+  it is missing, e.g. on a fresh database.
+* The counter can drift: a crash between a write and its `$inc`, or writes
+  made outside the app, are never reflected. So counter-backed totals are
+  reported as approximate, and once every `reconcile_seconds` one caller
+  replaces the counter with an exact count (that total is reported as exact).
+* While a counter is missing, `estimated_document_count()` (collection
+  metadata, no scan) stands in and the total is reported as approximate.
+* Filtered totals (searches) are counted once and kept for a short TTL.
+  A cached value may miss writes made since, so it is reported as approximate;
+  writes through `changed()` drop the cached counts for that collection.
+
+`total()` and `filtered()` return `(count, exact)`.
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+
+class CollectionCounters:
+    def __init__(self, mongo, cache_ttl=30, max_cached=256, reconcile_seconds=600):
+        self.mongo = mongo
+        self.cache_ttl = cache_ttl
+        self.reconcile = timedelta(seconds=reconcile_seconds)
+        self.max_cached = max_cached
+        self._lock = threading.Lock()
+        self._filtered = {}
+
+    @property
+    def counters(self):
+        return self.mongo.db.counters
+
+    def seed(self, name):
+        """Create the counter for `name` from an exact count if it doesn't exist yet."""
+        if self.counters.find_one({'_id': name}, {'_id': 1}):
+            return
+        count = self.mongo.db[name].count_documents({})
+        try:
+            self.counters.update_one({'_id': name}, {'$setOnInsert': {'count': count}}, upsert=True)
+        except DuplicateKeyError:
+            pass  # another process seeded it first
+        print(f"counters: seeded {name} at {count}")
+
+    def changed(self, name, delta):
+        """Record `delta` inserted (positive) or deleted (negative) documents."""
+        if delta:
+            self.counters.update_one({'_id': name}, {'$inc': {'count': delta}})
+        with self._lock:
+            for key in [key for key in self._filtered if key[0] == name]:
+                del self._filtered[key]
+
+    def total(self, name):
+        counter = self.counters.find_one({'_id': name})
+        if counter is None:
+            return self.mongo.db[name].estimated_document_count(), False
+        if self._claim_reconcile(name, counter):
+            count = self.mongo.db[name].count_documents({})
+            self.counters.update_one({'_id': name}, {'$set': {'count': count}})
+            return count, True
+        return max(counter['count'], 0), False
+
+    def _claim_reconcile(self, name, counter):
+        """True for the one caller that gets to recount `name` this interval."""
+        now = datetime.now(timezone.utc)
+        last = counter.get('reconciled_at')
+        if last is not None:
+            if last.tzinfo is None:
+                last = last.replace(tzinfo=timezone.utc)
+            if last > now - self.reconcile:
+                return False
+        claimed = self.counters.update_one(
+            {'_id': name, 'reconciled_at': counter.get('reconciled_at')},
+            {'$set': {'reconciled_at': now}}
+        )
+        return claimed.modified_count == 1
+
+    def filtered(self, name, match, count):
+        """Total for `match`, computed with `count()` at most once per TTL."""
+        key = (name, json.dumps(match, sort_keys=True, default=str))
+        now = time.monotonic()
+        cached = self._filtered.get(key)
+        if cached is not None and cached[1] > now:
+            return cached[0], False
+        value = count()
+        with self._lock:
+            if len(self._filtered) >= self.max_cached:
+                # Drop expired entries, or the oldest one if none have expired
+                expired = [k for k, (_, expires) in self._filtered.items() if expires <= now]
+                for stale in expired or [next(iter(self._filtered))]:
+                    del self._filtered[stale]
+            self._filtered[key] = (value, now + self.cache_ttl)
+        return value, True
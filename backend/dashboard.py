@@ -0,0 +1,261 @@
+"""
+Data for the admin dashboard (contacts and meetings tables).
+
+Tables are ordered newest first on a unique key: (timestamp, _id) for
+contacts and (meeting_datetime, _id) for meetings, each backed by a compound
+index. A page can be addressed two ways:
+
+* by an opaque cursor (`cursor` / `meetings_cursor`) taken from the previous
+  response's `next_cursor` / `prev_cursor`. This is a keyset range seek on
+  the index, so every page costs the same however deep it is;
+* by page number, which needs a skip; pages past MAX_PAGE are rejected.
+
+Search goes through a MongoDB text index on each table (contacts: name, email,
+message; meetings: also company and project_type). Results are ranked by
+relevance and paged by number. User input is reduced to plain terms, so quotes
+and leading dashes can't turn into phrase or negation operators. Where the
+collection has no text index, search falls back to case-insensitive regexes
+over the escaped input, and the text index is tried again after
+TEXT_RETRY_SECONDS. Other query errors are raised.
+
+The page queries and the totals are independent, so they run concurrently
+and a dashboard load costs roughly one round-trip. Totals come from
+counters.py (maintained counters, cached search counts) and each pagination
+block says whether its total is exact. Only the fields the dashboard shows are
+projected.
+"""
+import base64
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import OperationFailure
+
+# Deeper pages must be reached with cursors; skip cost grows with the page number
+MAX_PAGE = 50
+# How long search stays on regexes after finding no text index
+TEXT_RETRY_SECONDS = 300
+# OperationFailure codes: the $text query has no index to use / the query itself is invalid
+INDEX_NOT_FOUND = 27
+BAD_VALUE = 2
+
+CONTACT_FIELDS = {'name': 1, 'email': 1, 'message': 1, 'timestamp': 1}
+MEETING_FIELDS = {'name': 1, 'email': 1, 'meeting_datetime': 1, 'status': 1, 'meeting_link': 1}
+
+
+def serialize_contact(contact):
+    return {
+        'id': str(contact.get('_id')),
+        'name': contact.get('name'),
+        'email': contact.get('email'),
+        'message': contact.get('message'),
+        'timestamp': contact.get('timestamp').isoformat() if contact.get('timestamp') else None
+    }
+
+
+def serialize_meeting(meeting):
+    return {
+        'id': str(meeting.get('_id')),
+        'name': meeting.get('name'),
+        'email': meeting.get('email'),
+        'meeting_datetime': meeting.get('meeting_datetime').isoformat() if meeting.get('meeting_datetime') else None,
+        'status': meeting.get('status', 'pending'),
+        'meeting_link': meeting.get('meeting_link', '')
+    }
+
+
+def encode_cursor(direction, doc, sort_field):
+    value = doc.get(sort_field)
+    payload = {'d': direction, 'v': value.isoformat() if value else None, 'id': str(doc['_id'])}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Return (direction, sort value, _id); raises ValueError for a malformed token."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        value = datetime.fromisoformat(payload['v']) if payload['v'] else None
+        if payload['d'] not in ('next', 'prev'):
+            raise ValueError(payload['d'])
+        return payload['d'], value, ObjectId(payload['id'])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid pagination cursor: {e}")
+
+
+def text_terms(search):
+    """Plain search terms for $text: no phrases, no negations."""
+    terms = (term.strip('"').lstrip('-') for term in search.replace('"', ' ').split())
+    return ' '.join(term for term in terms if term)
+
+
+class KeysetTable:
+    """One dashboard table ordered by (sort_field desc, _id desc)."""
+
+    def __init__(self, collection_name, sort_field, projection, serialize, search_weights):
+        self.collection_name = collection_name
+        self.sort_field = sort_field
+        self.projection = projection
+        self.serialize = serialize
+        # field -> relevance weight for the text index
+        self.search_weights = search_weights
+        self._regex_until = 0
+
+    @property
+    def text_search(self):
+        return time.monotonic() >= self._regex_until
+
+    def ensure_index(self, db):
+        collection = db[self.collection_name]
+        collection.create_index([(self.sort_field, -1), ('_id', -1)])
+        collection.create_index(
+            [(field, 'text') for field in self.search_weights],
+            weights=self.search_weights,
+            name=f'{self.collection_name}_search'
+        )
+
+    def search_match(self, search):
+        """The filter for a search string; {} matches everything."""
+        search = search.strip()
+        if not search:
+            return {}
+        if self.text_search:
+            terms = text_terms(search)
+            return {'$text': {'$search': terms}} if terms else {}
+        pattern = re.escape(search)
+        return {'$or': [{field: {'$regex': pattern, '$options': 'i'}} for field in self.search_weights]}
+
+    def _text_fallback(self, e):
+        print(f"dashboard: text search unavailable on {self.collection_name} ({e}); "
+              f"using regex search for {TEXT_RETRY_SECONDS}s")
+        self._regex_until = time.monotonic() + TEXT_RETRY_SECONDS
+
+    def search(self, db, search, per_page, page=1):
+        """Return (documents, has_more_after, has_more_before, match) for a search, best matches first."""
+        match = self.search_match(search)
+        collection = db[self.collection_name]
+        skip = (page - 1) * per_page
+        try:
+            if '$text' in match:
+                projection = dict(self.projection, score={'$meta': 'textScore'})
+                cursor = collection.find(match, projection).sort([('score', {'$meta': 'textScore'}), ('_id', -1)])
+            else:
+                cursor = collection.find(match, self.projection).sort([(self.sort_field, -1), ('_id', -1)])
+            docs = list(cursor.skip(skip).limit(per_page + 1))
+        except OperationFailure as e:
+            if '$text' in match and e.code == INDEX_NOT_FOUND:
+                self._text_fallback(e)
+                return self.search(db, search, per_page, page)
+            if e.code == BAD_VALUE:
+                raise ValueError(f"Invalid search: {e}")
+            raise
+        return docs[:per_page], len(docs) > per_page, page > 1, match
+
+    def _seek(self, direction, value, oid):
+        # Rows after the cursor in display order (older), or before it (newer) for 'prev'
+        op = '$lt' if direction == 'next' else '$gt'
+        return {'$or': [{self.sort_field: {op: value}}, {self.sort_field: value, '_id': {op: oid}}]}
+
+    def fetch(self, db, match, per_page, page=1, cursor=None):
+        """Return (documents, has_more_after, has_more_before) for one page."""
+        collection = db[self.collection_name]
+        order = [(self.sort_field, -1), ('_id', -1)]
+        if cursor is None:
+            docs = list(collection.find(match, self.projection).sort(order)
+                        .skip((page - 1) * per_page).limit(per_page + 1))
+            return docs[:per_page], len(docs) > per_page, page > 1
+
+        direction, value, oid = cursor
+        seek = self._seek(direction, value, oid)
+        query = {'$and': [match, seek]} if match else seek
+        if direction == 'next':
+            docs = list(collection.find(query, self.projection).sort(order).limit(per_page + 1))
+            return docs[:per_page], len(docs) > per_page, True
+        # Walk backwards from the cursor, then restore display order
+        reverse = [(self.sort_field, 1), ('_id', 1)]
+        docs = list(collection.find(query, self.projection).sort(reverse).limit(per_page + 1))
+        has_before = len(docs) > per_page
+        return list(reversed(docs[:per_page])), True, has_before
+
+    def pagination(self, docs, has_after, has_before, page, per_page, total, keyset=True):
+        count, exact = total
+        return {
+            'page': page,
+            'per_page': per_page,
+            'total': count,
+            'total_exact': exact,
+            'max_page': MAX_PAGE,
+            'next_cursor': encode_cursor('next', docs[-1], self.sort_field) if keyset and docs and has_after else None,
+            'prev_cursor': encode_cursor('prev', docs[0], self.sort_field) if keyset and docs and has_before else None
+        }
+
+
+CONTACTS = KeysetTable('contacts', 'timestamp', CONTACT_FIELDS, serialize_contact,
+                       {'name': 5, 'email': 5, 'message': 1})
+MEETINGS = KeysetTable('meetings', 'meeting_datetime', MEETING_FIELDS, serialize_meeting,
+                       {'name': 5, 'email': 5, 'company': 3, 'project_type': 2, 'message': 1})
+
+
+class DashboardService:
+    def __init__(self, mongo, counters, per_page=10):
+        self.mongo = mongo
+        self.counters = counters
+        self.per_page = per_page
+        # One worker per query; pymongo clients are thread-safe
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='dashboard')
+
+    def ensure_indexes(self):
+        for table in (CONTACTS, MEETINGS):
+            table.ensure_index(self.mongo.db)
+
+    def load(self, page=1, search='', meetings_page=1, cursor=None, meetings_cursor=None):
+        """Build the dashboard payload. Cursors are the opaque tokens from a previous response.
+
+        `search` filters both tables; search results are ranked and paged by number only.
+        """
+        per_page = self.per_page
+        page = max(page, 1)
+        meetings_page = max(meetings_page, 1)
+        if max(page, meetings_page) > MAX_PAGE:
+            raise ValueError(f"Page numbers stop at {MAX_PAGE}. Follow next_cursor to go further, "
+                             "or narrow the search.")
+        contacts_cursor = decode_cursor(cursor) if cursor else None
+        meetings_cursor = decode_cursor(meetings_cursor) if meetings_cursor else None
+        search = (search or '').strip()
+        if search:
+            contacts_cursor = meetings_cursor = None
+
+        contacts = self._submit(CONTACTS, search, per_page, page, contacts_cursor)
+        meetings = self._submit(MEETINGS, search, per_page, meetings_page, meetings_cursor)
+        contacts_docs, contacts_after, contacts_before, contacts_total = contacts()
+        meetings_docs, meetings_after, meetings_before, meetings_total = meetings()
+
+        return {
+            'contacts': [CONTACTS.serialize(contact) for contact in contacts_docs],
+            'meetings': [MEETINGS.serialize(meeting) for meeting in meetings_docs],
+            'contacts_pagination': CONTACTS.pagination(
+                contacts_docs, contacts_after, contacts_before, None if contacts_cursor else page, per_page,
+                contacts_total, keyset=not search
+            ),
+            'meetings_pagination': MEETINGS.pagination(
+                meetings_docs, meetings_after, meetings_before, None if meetings_cursor else meetings_page, per_page,
+                meetings_total, keyset=not search
+            )
+        }
+
+    def _submit(self, table, search, per_page, page, cursor):
+        """Start one table's page and total; returns a callable that waits for both."""
+        db = self.mongo.db
+        name = table.collection_name
+        if search:
+            def search_page():
+                docs, has_after, has_before, match = table.search(db, search, per_page, page)
+                total = self.counters.filtered(name, match, lambda: db[name].count_documents(match))
+                return docs, has_after, has_before, total
+            return self._executor.submit(search_page).result
+        page_future = self._executor.submit(table.fetch, db, {}, per_page, page, cursor)
+        total_future = self._executor.submit(self.counters.total, name)
+        return lambda: page_future.result() + (total_future.result(),)
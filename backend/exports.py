@@ -0,0 +1,386 @@
+"""
+Streaming exports for the admin downloads.
+
+Exports never hold the whole collection in memory. A projected cursor is
+iterated in batches of EXPORT_BATCH_SIZE documents, and rows are written
+into a small buffer that is flushed to the response every `chunk_rows` rows.
+With gzip the same chunks go through one streaming compressor, so the
+response is compressed on the fly as well.
+
+Each dataset lists the fields it can export. Callers choose:
+* the columns (`fields`);
+* a date range on the dataset's date field (`from`/`to`);
+* meeting statuses (`status`).
+All three are turned into the Mongo query and projection, so unselected
+fields and filtered-out documents never leave the database.
+
+Formats:
+* csv: formatted for spreadsheets.
+* ndjson: one JSON object per line, ISO datetimes.
+* parquet: typed columns, one row group per batch. Parquet needs `pyarrow`
+  (in requirements.txt); where it isn't installed, such as the slimmer Netlify
+  function bundle, `ExportUnavailable` is raised.
+
+Delta exports (`delta_page`) return what changed after a watermark. Every
+contact and meeting write sets `updated_at`, and changes are read in
+(updated_at, _id) order off a compound index. Each page carries the
+watermark of its last record, so a sync job keeps its place by passing that
+back as `since`. Records newer than DELTA_SETTLE are held back until the next
+call, so a write whose timestamp was taken just before a concurrent read is
+not skipped.
+
+Deletes leave a tombstone in `export_tombstones` ({_id: the deleted record's
+_id, dataset, updated_at}). Tombstones are merged into the same (updated_at,
+_id) stream and come out as {'id', 'deleted': True, 'updated_at'}; live
+records carry 'deleted': False. Tombstones expire after TOMBSTONE_DAYS, so a
+sync job that falls further behind than that should start over without
+`since`.
+"""
+import base64
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, time, timedelta, timezone
+from io import StringIO
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional: only needed for Parquet exports
+    pyarrow = None
+
+EXPORT_BATCH_SIZE = 1000
+FORMATS = ('csv', 'ndjson', 'parquet')
+DELTA_INDEX = [('updated_at', 1), ('_id', 1)]
+DELTA_SETTLE = timedelta(seconds=5)
+MAX_DELTA_LIMIT = 5000
+TOMBSTONES = 'export_tombstones'
+TOMBSTONE_DAYS = 90
+
+
+class ExportUnavailable(Exception):
+    """The requested export format needs an optional dependency that isn't installed."""
+
+
+def format_datetime(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+
+def yes_no(value):
+    return 'Yes' if value else 'No'
+
+
+class Column:
+    """One exported field: header, source field, type, and its CSV formatting."""
+
+    def __init__(self, header, field, kind='string', format=None, default=''):
+        self.header = header
+        self.field = field
+        # Name used in `fields=` and as the NDJSON/Parquet key
+        self.key = 'id' if field == '_id' else field
+        self.kind = kind
+        self.format = format
+        self.default = default
+
+    def value(self, doc):
+        """The CSV cell."""
+        value = doc.get(self.field)
+        if self.format is not None:
+            return self.format(value)
+        return self.default if value is None else value
+
+    def raw(self, doc):
+        """The typed value for NDJSON/Parquet."""
+        value = doc.get(self.field)
+        if value is None:
+            return self.default or None
+        if self.kind == 'string' and not isinstance(value, str):
+            return str(value)
+        return value
+
+
+class Dataset:
+    def __init__(self, name, columns, default_fields, date_field, status_field=None):
+        self.name = name
+        self.columns = {column.key: column for column in columns}
+        self.default_fields = default_fields
+        self.date_field = date_field
+        self.status_field = status_field
+
+    def select(self, fields=None):
+        """Columns for a comma-separated `fields` value (the default columns when empty)."""
+        keys = [key.strip() for key in fields.split(',') if key.strip()] if fields else self.default_fields
+        unknown = [key for key in keys if key not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown {self.name} field(s): {', '.join(unknown)}. "
+                             f"Available: {', '.join(self.columns)}")
+        return [self.columns[key] for key in keys]
+
+    def query(self, start=None, end=None, statuses=None):
+        """The Mongo filter for an inclusive [start, end] date range and a list of statuses."""
+        query = {}
+        if start or end:
+            bounds = {}
+            if start:
+                bounds['$gte'] = datetime.combine(start, time())
+            if end:
+                bounds['$lt'] = datetime.combine(end + timedelta(days=1), time())
+            query[self.date_field] = bounds
+        if statuses:
+            if not self.status_field:
+                raise ValueError(f"{self.name} can't be filtered by status")
+            query[self.status_field] = {'$in': statuses}
+        return query
+
+
+CONTACTS = Dataset('contacts', [
+    Column('ID', '_id'),
+    Column('Name', 'name'),
+    Column('Email', 'email'),
+    Column('Message', 'message'),
+    Column('Timestamp', 'timestamp', 'datetime', format_datetime),
+    Column('Email Sent', 'email_sent', 'bool', yes_no)
+], ['name', 'email', 'message', 'timestamp', 'email_sent'], date_field='timestamp')
+
+MEETINGS = Dataset('meetings', [
+    Column('ID', '_id'),
+    Column('Name', 'name'),
+    Column('Email', 'email'),
+    Column('Phone', 'phone'),
+    Column('Company', 'company'),
+    Column('Company URL', 'company_url'),
+    Column('Project Type', 'project_type'),
+    Column('Budget', 'budget'),
+    Column('Message', 'message'),
+    Column('Meeting DateTime', 'meeting_datetime', 'datetime', format_datetime),
+    Column('Duration', 'duration', 'int'),
+    Column('Status', 'status', default='pending'),
+    Column('Meeting Link', 'meeting_link'),
+    Column('Requested At', 'timestamp', 'datetime', format_datetime),
+    Column('Email Sent', 'email_sent', 'bool', yes_no)
+], ['name', 'email', 'meeting_datetime', 'status', 'meeting_link'], date_field='meeting_datetime',
+    status_field='status')
+
+DATASETS = {dataset.name: dataset for dataset in (CONTACTS, MEETINGS)}
+
+
+def projection(columns):
+    return {column.field: 1 for column in columns}
+
+
+def export_cursor(collection, columns, query=None):
+    """A cursor over just the exported fields, fetched in batches, in insertion order."""
+    return (collection.find(query or {}, projection(columns))
+            .sort('_id', 1)
+            .batch_size(EXPORT_BATCH_SIZE))
+
+
+def csv_chunks(docs, columns, chunk_rows=500):
+    """Yield the CSV text for `docs` a few hundred rows at a time."""
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.header for column in columns])
+    rows = 0
+    for doc in docs:
+        writer.writerow([column.value(doc) for column in columns])
+        rows += 1
+        if rows % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def ndjson_chunks(docs, columns, chunk_rows=500):
+    lines = []
+    for doc in docs:
+        lines.append(json.dumps({column.key: column.raw(doc) for column in columns},
+                                default=json_default, ensure_ascii=False))
+        if len(lines) == chunk_rows:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def encode(chunks, encoding='utf-8'):
+    for chunk in chunks:
+        yield chunk.encode(encoding)
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip a stream of byte chunks without buffering it."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class _DrainableSink(io.RawIOBase):
+    """A write-only file that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data, self._parts = b''.join(self._parts), []
+        return data
+
+
+def parquet_schema(columns):
+    types = {
+        'string': pyarrow.string(),
+        'datetime': pyarrow.timestamp('ms'),
+        'bool': pyarrow.bool_(),
+        'int': pyarrow.int64()
+    }
+    return pyarrow.schema([(column.key, types[column.kind]) for column in columns])
+
+
+def parquet_chunks(docs, columns, row_group_rows=EXPORT_BATCH_SIZE):
+    """Yield a Parquet file one row group at a time."""
+    if pyarrow is None:
+        raise ExportUnavailable("Parquet export requires the pyarrow package")
+    schema = parquet_schema(columns)
+    sink = _DrainableSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression='snappy')
+
+    def row_group(rows):
+        table = pyarrow.Table.from_pydict(
+            {column.key: [column.raw(doc) for doc in rows] for column in columns}, schema=schema
+        )
+        writer.write_table(table)
+        return sink.drain()
+
+    rows = []
+    for doc in docs:
+        rows.append(doc)
+        if len(rows) == row_group_rows:
+            yield row_group(rows)
+            rows = []
+    if rows:
+        yield row_group(rows)
+    writer.close()
+    yield sink.drain()
+
+
+def export_stream(collection, dataset, export_format, fields=None, start=None, end=None, statuses=None):
+    """Validate an export and return (byte chunks, mimetype, file extension).
+
+    Raises ValueError for bad parameters and ExportUnavailable for a missing optional dependency,
+    both before anything is read from the database.
+    """
+    if export_format not in FORMATS:
+        raise ValueError(f"Invalid format. Use one of: {', '.join(FORMATS)}")
+    if export_format == 'parquet' and pyarrow is None:
+        raise ExportUnavailable("Parquet export requires the pyarrow package")
+    columns = dataset.select(fields)
+    docs = export_cursor(collection, columns, dataset.query(start, end, statuses))
+    if export_format == 'csv':
+        return encode(csv_chunks(docs, columns)), 'text/csv', 'csv'
+    if export_format == 'ndjson':
+        return encode(ndjson_chunks(docs, columns)), 'application/x-ndjson', 'ndjson'
+    return parquet_chunks(docs, columns), 'application/vnd.apache.parquet', 'parquet'
+
+
+def ensure_indexes(db):
+    for dataset in DATASETS.values():
+        db[dataset.name].create_index(DELTA_INDEX)
+    db[TOMBSTONES].create_index([('dataset', 1)] + DELTA_INDEX)
+    db[TOMBSTONES].create_index('updated_at', expireAfterSeconds=TOMBSTONE_DAYS * 86400,
+                                name='tombstone_expiry')
+
+
+def record_deleted(db, dataset, ids):
+    """Leave tombstones for deleted records of `dataset` so delta exports report them."""
+    if not ids:
+        return
+    now = datetime.now(timezone.utc)
+    try:
+        db[TOMBSTONES].insert_many([{'_id': record_id, 'dataset': dataset.name, 'updated_at': now}
+                                    for record_id in ids], ordered=False)
+    except Exception as e:
+        # Never fail the delete itself; the record is already gone
+        print(f"exports: failed to record deleted {dataset.name}: {e}")
+
+
+def encode_watermark(doc):
+    payload = {'t': doc['updated_at'].isoformat(), 'id': str(doc['_id'])}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_watermark(token):
+    """Return (updated_at, _id); raises ValueError for a malformed watermark."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        return datetime.fromisoformat(payload['t']), ObjectId(payload['id'])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid watermark: {e}")
+
+
+def delta_page(collection, dataset, fields=None, since=None, limit=1000, tombstones=None):
+    """Records of `dataset` changed or deleted after the `since` watermark, oldest change first.
+
+    Returns {'records', 'watermark', 'has_more'}; `fields` defaults to every exported field.
+    Deletions are read from the `tombstones` collection when one is given.
+    """
+    columns = dataset.select(fields or ','.join(dataset.columns))
+    limit = max(1, min(limit, MAX_DELTA_LIMIT))
+    settled = datetime.now(timezone.utc) - DELTA_SETTLE
+    query = {'updated_at': {'$lte': settled}}
+    if since:
+        updated_at, last_id = decode_watermark(since)
+        query = {'$and': [query, {'$or': [
+            {'updated_at': {'$gt': updated_at}},
+            {'updated_at': updated_at, '_id': {'$gt': last_id}}
+        ]}]}
+    docs = list(collection.find(query, dict(projection(columns), updated_at=1))
+                .sort(DELTA_INDEX)
+                .limit(limit + 1))
+    if tombstones is not None:
+        # Both sides are sorted on the same key, so the first limit + 1 of the merge are exact
+        gone = tombstones.find({'$and': [{'dataset': dataset.name}, query]}).sort(DELTA_INDEX).limit(limit + 1)
+        docs = sorted(docs + [dict(doc, deleted=True) for doc in gone],
+                      key=lambda doc: (doc['updated_at'], doc['_id']))[:limit + 1]
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    records = []
+    for doc in docs:
+        record = {'id': str(doc['_id'])}
+        if doc.get('deleted'):
+            record['deleted'] = True
+        else:
+            record.update((column.key, column.raw(doc)) for column in columns)
+            record['deleted'] = False
+        record['updated_at'] = doc['updated_at']
+        records.append(record)
+    return {
+        'records': records,
+        'watermark': encode_watermark(docs[-1]) if docs else since,
+        'has_more': has_more
+    }
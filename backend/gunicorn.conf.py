@@ -0,0 +1,34 @@
+"""
+Gunicorn settings, picked up automatically when gunicorn is started from backend/:
+
+    gunicorn app:app
+
+The slot event stream (/api/slots/events) keeps a connection open for minutes,
+so workers are threaded (gthread). Only half of each worker's threads may be
+used by streams, which leaves the rest for ordinary requests.
+
+Slot events are published by an in-process broker (slot_events.py). A booking
+handled by one worker is never announced to streams held by another, and a
+reconnect carrying Last-Event-ID can land on a worker that never saw that id.
+So the default is a single worker while the stream is enabled; scale with
+GUNICORN_THREADS instead. Raise GUNICORN_WORKERS only with
+SLOT_EVENTS_DISABLED=true, or if visitors may miss some live updates (the
+booking itself is still rejected if the slot was taken meanwhile).
+"""
+import os
+
+events_enabled = os.getenv('SLOT_EVENTS_DISABLED', '') != 'true'
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', '1' if events_enabled else '2'))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '32'))
+
+# Read by app.py when each worker imports it
+os.environ.setdefault('SLOT_EVENTS_MAX_CLIENTS', str(max(1, threads // 2)))
+
+
+def post_worker_init(worker):
+    # The app doesn't start threads on import; each worker starts its own once it has loaded
+    from app import start_background
+    start_background()
@@ -0,0 +1,92 @@
+"""
+Compiled Jinja templates for outgoing email.
+
+Each email is one template in backend/email_templates/ that extends the shared
+layout. It sets `subject` and `theme` at the top level and fills a `text` and
+an `html` block. Every template is compiled once at import, for an escaping
+HTML environment and a plain-text one, and cached here. Rendering an email is
+then two calls into already-compiled code.
+"""
+import os
+
+from flask_mail import Message
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from markupsafe import Markup, escape
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'email_templates')
+
+SUPPORT_EMAIL = 'aidaddy.in@gmail.com'
+
+THEMES = {
+    'blue': {'accent': '#2563eb', 'dark': '#1d4ed8', 'tint': '#e3f2fd'},
+    'green': {'accent': '#10b981', 'dark': '#059669', 'tint': '#d1fae5'},
+    'amber': {'accent': '#f59e0b', 'dark': '#d97706', 'tint': '#fef3c7'},
+}
+
+
+def long_datetime(value, default=None):
+    if not value:
+        return default if default is not None else ''
+    return value.strftime('%A, %B %d, %Y at %I:%M %p')
+
+
+def nl2br(value):
+    return Markup('<br>').join(escape(value or '').split('\n'))
+
+
+class RenderedEmail:
+    def __init__(self, subject, text, html):
+        self.subject = subject
+        self.text = text
+        self.html = html
+
+
+class EmailTemplates:
+    def __init__(self, directory=TEMPLATE_DIR):
+        loader = FileSystemLoader(directory)
+        self.environments = {
+            'html': self._environment(loader, autoescape=True),
+            'text': self._environment(loader, autoescape=False)
+        }
+        # Layout and partials (leading underscore) are only ever pulled in by other templates
+        self.names = sorted(
+            name[:-3] for name in os.listdir(directory)
+            if name.endswith('.j2') and name != 'layout.j2' and not name.startswith('_')
+        )
+        self._compiled = {
+            fmt: {name: env.get_template(name + '.j2') for name in self.names}
+            for fmt, env in self.environments.items()
+        }
+
+    def _environment(self, loader, autoescape):
+        env = Environment(
+            loader=loader,
+            autoescape=autoescape,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            undefined=StrictUndefined,
+            # Compiled templates are held in self._compiled; never re-stat the files
+            auto_reload=False
+        )
+        env.filters['long_datetime'] = long_datetime
+        env.filters['nl2br'] = nl2br
+        env.globals['themes'] = THEMES
+        env.globals['support_email'] = SUPPORT_EMAIL
+        return env
+
+    def render(self, template, /, **context):
+        text_module = self._compiled['text'][template].make_module(dict(context, format='text'))
+        html_module = self._compiled['html'][template].make_module(dict(context, format='html'))
+        return RenderedEmail(
+            subject=str(text_module.subject).strip(),
+            text=str(text_module).strip() + '\n',
+            html=str(html_module)
+        )
+
+    def message(self, template, recipients, /, **context):
+        """Render `template` into a Flask-Mail Message for `recipients`."""
+        rendered = self.render(template, **context)
+        return Message(rendered.subject, recipients=recipients, body=rendered.text, html=rendered.html)
+
+
+templates = EmailTemplates()
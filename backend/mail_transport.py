@@ -0,0 +1,296 @@
+"""
+Mail transports for Flask-Mail: pooled SMTP, a local maildir, and in-memory.
+
+`create_mail(app)` picks one from MAIL_TRANSPORT. All of them are `Mail`
+subclasses that go through Flask-Mail's own Connection.send (validation,
+Date header, email_dispatched signal), so the app code path is identical and
+only the final hand-off differs. The file and memory sinks let load tests
+drive thousands of bookings through the real flow without touching Gmail.
+
+Flask-Mail opens a new SMTP session (connect, STARTTLS, AUTH, QUIT) for every
+`mail.send()`. `PooledMail` is a drop-in replacement that keeps a few
+authenticated sessions open between sends. `mail.send(msg)` and
+`with mail.connect() as conn: conn.send(a); conn.send(b)` both borrow a session
+from the pool, so a batch of messages goes out over a single handshake.
+
+A session that has sat idle is checked with NOOP before it is reused. One
+that is too old, or that the server dropped, is closed and replaced. A send
+that fails because the connection went away is retried once on a fresh session.
+
+Configuration (app.config / environment):
+    MAIL_TRANSPORT          smtp (default), file or memory
+    MAIL_FILE_DIR           maildir the file transport writes .eml files to
+                            (default: <instance>/maildir)
+    MAIL_MEMORY_LIMIT       messages the memory transport keeps (default: 10000)
+    MAIL_POOL_SIZE          idle sessions kept open (default: 2)
+    MAIL_POOL_MAX_IDLE      seconds an idle session is kept before closing (default: 60)
+    MAIL_POOL_CHECK_AFTER   idle seconds after which a session is NOOP-checked (default: 5)
+"""
+import abc
+import mailbox
+import os
+import smtplib
+import threading
+import time
+from collections import deque
+
+from flask_mail import Connection, Mail
+
+# Errors that mean the session is unusable, as opposed to the server rejecting this message
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class PooledSession:
+    def __init__(self, host):
+        self.host = host
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+    def close(self):
+        try:
+            self.host.quit()
+        except Exception:
+            try:
+                self.host.close()
+            except Exception:
+                pass
+
+
+class SMTPPool:
+    def __init__(self, connect, size=2, max_idle=60, check_after=5):
+        self._connect = connect
+        self.size = size
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def acquire(self):
+        """Borrow a healthy session, opening a new one when none is idle."""
+        while True:
+            with self._lock:
+                self._check_fork()
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                return PooledSession(self._connect())
+            idle = time.monotonic() - session.last_used
+            if idle > self.max_idle:
+                session.close()
+                continue
+            if idle > self.check_after and not self._alive(session):
+                session.close()
+                continue
+            return session
+
+    def release(self, session):
+        session.last_used = time.monotonic()
+        with self._lock:
+            self._check_fork()
+            if len(self._idle) < self.size:
+                self._idle.append(session)
+                return
+        session.close()
+
+    def discard(self, session):
+        session.close()
+
+    def close(self):
+        with self._lock:
+            sessions, self._idle = list(self._idle), deque()
+        for session in sessions:
+            session.close()
+
+    def _alive(self, session):
+        try:
+            return session.host.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _check_fork(self):
+        # A forked worker must not share the parent's sockets; forget them without QUIT
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle.clear()
+
+
+class PooledConnection(Connection):
+    """A Flask-Mail connection whose SMTP session comes from (and returns to) the pool."""
+
+    def __init__(self, mail, pool):
+        super().__init__(mail)
+        self.pool = pool
+        self.session = None
+
+    def __enter__(self):
+        self.num_emails = 0
+        if self.mail.suppress:
+            self.host = None
+        else:
+            self.session = self.pool.acquire()
+            self.host = self.session.host
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if self.session is None:
+            return
+        if exc_type is not None and issubclass(exc_type, CONNECTION_ERRORS):
+            self.pool.discard(self.session)
+        else:
+            self.session.host = self.host
+            self.pool.release(self.session)
+        self.session = None
+
+    def send(self, message, envelope_from=None):
+        try:
+            super().send(message, envelope_from)
+        except CONNECTION_ERRORS as e:
+            if self.session is None:
+                raise
+            print(f"mail: SMTP session dropped ({e}); reconnecting")
+            self._drop_session()
+            self.session = self.pool.acquire()
+            self.host = self.session.host
+            try:
+                super().send(message, envelope_from)
+            except CONNECTION_ERRORS:
+                self._drop_session()
+                raise
+
+    def _drop_session(self):
+        # self.host keeps pointing at the dead session so later sends fail loudly
+        # instead of being skipped as if mail were suppressed
+        self.pool.discard(self.session)
+        self.session = None
+
+
+class TransportMail(Mail, metaclass=abc.ABCMeta):
+    """Base for the transports: `connect()` hands out a transport-specific Connection."""
+
+    @abc.abstractmethod
+    def _connection(self, state):
+        """Return the Connection for one `connect()` call."""
+
+    def connect(self):
+        state = self.state
+        if state is None:
+            raise RuntimeError("The current application was not configured with Flask-Mail")
+        return self._connection(state)
+
+    def send_many(self, messages):
+        """Send `messages` over one connection; returns one error (or None) per message."""
+        errors = []
+        with self.connect() as connection:
+            for message in messages:
+                try:
+                    connection.send(message)
+                    errors.append(None)
+                except Exception as e:
+                    errors.append(e)
+        return errors
+
+
+class PooledMail(TransportMail):
+    def init_app(self, app):
+        state = super().init_app(app)
+        state.pool = SMTPPool(
+            lambda: Connection(state).configure_host(),
+            size=int(app.config.get('MAIL_POOL_SIZE', os.getenv('MAIL_POOL_SIZE', '2'))),
+            max_idle=float(app.config.get('MAIL_POOL_MAX_IDLE', os.getenv('MAIL_POOL_MAX_IDLE', '60'))),
+            check_after=float(app.config.get('MAIL_POOL_CHECK_AFTER', os.getenv('MAIL_POOL_CHECK_AFTER', '5')))
+        )
+        return state
+
+    def _connection(self, state):
+        return PooledConnection(state, state.pool)
+
+
+class SinkConnection(Connection):
+    """A Connection whose "SMTP host" is a local sink with the same sendmail() signature."""
+
+    def __init__(self, mail, sink):
+        super().__init__(mail)
+        self.sink = sink
+
+    def configure_host(self):
+        return self.sink
+
+    def __exit__(self, exc_type, exc_value, tb):
+        pass
+
+
+class MaildirSink:
+    def __init__(self, directory):
+        self.directory = directory
+        self.maildir = mailbox.Maildir(directory, create=True)
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        # Record the envelope so Bcc recipients are visible when inspecting the .eml
+        envelope = f"X-Envelope-From: {from_addr}\r\nX-Envelope-To: {', '.join(to_addrs)}\r\n".encode('utf-8')
+        self.maildir.add(envelope + msg)
+        return {}
+
+    def quit(self):
+        pass
+
+
+class MemorySink:
+    def __init__(self, limit=10000):
+        self.messages = deque(maxlen=limit)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        with self._lock:
+            self.messages.append({'sender': from_addr, 'recipients': list(to_addrs), 'data': msg})
+            self.count += 1
+        return {}
+
+    def quit(self):
+        pass
+
+    def clear(self):
+        with self._lock:
+            self.messages.clear()
+            self.count = 0
+
+
+class FileMail(TransportMail):
+    """Writes each message as an .eml file into a maildir instead of sending it."""
+
+    def init_app(self, app):
+        state = super().init_app(app)
+        directory = app.config.get('MAIL_FILE_DIR') or os.getenv('MAIL_FILE_DIR') or os.path.join(app.instance_path, 'maildir')
+        state.sink = MaildirSink(directory)
+        return state
+
+    def _connection(self, state):
+        return SinkConnection(state, state.sink)
+
+
+class MemoryMail(TransportMail):
+    """Keeps sent messages in a bounded in-process list (`mail.sink.messages`)."""
+
+    def init_app(self, app):
+        state = super().init_app(app)
+        state.sink = MemorySink(int(app.config.get('MAIL_MEMORY_LIMIT', os.getenv('MAIL_MEMORY_LIMIT', '10000'))))
+        return state
+
+    def _connection(self, state):
+        return SinkConnection(state, state.sink)
+
+
+TRANSPORTS = {
+    'smtp': PooledMail,
+    'file': FileMail,
+    'memory': MemoryMail
+}
+
+
+def create_mail(app):
+    """Build the Mail extension for the transport named by MAIL_TRANSPORT."""
+    name = (app.config.get('MAIL_TRANSPORT') or os.getenv('MAIL_TRANSPORT') or 'smtp').lower()
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown MAIL_TRANSPORT {name!r}; expected one of {', '.join(TRANSPORTS)}")
+    print(f"mail: using {name} transport")
+    return TRANSPORTS[name](app)
@@ -0,0 +1,277 @@
+"""
+Newsletter fan-out for newly published blog posts.
+
+Publishing a post creates one document in `newsletter_campaigns` (unique per
+post, so re-publishing never mails the list twice). The email is rendered
+once with placeholder tokens and stored on the campaign. Each subscriber then
+only costs two string substitutions. A background thread walks the
+`subscribers` collection in _id order, a batch at a time. Each batch goes out
+over one pooled SMTP session, and the send rate is capped at
+NEWSLETTER_RATE_PER_MINUTE.
+
+After every batch the campaign records the last subscriber _id it reached and
+its sent/failed counts. Whoever holds the campaign lease renews it each batch.
+If the process dies, the lease expires, and `resume()` at the next startup
+continues from the checkpoint. At most one batch is re-sent.
+
+Serverless deployments (NETLIFY / EMAIL_OUTBOX_INLINE) have no process that
+outlives a request, so nothing sends in the background there. Campaigns are
+created as usual and sent by calling POST /api/admin/newsletter/send, e.g. from
+a scheduled function or cron job. Each call sends a bounded number of batches
+(`send_due()`) and hands the campaign back for the next call.
+
+Configuration (environment variables):
+    NEWSLETTER_BATCH_SIZE       subscribers per batch / SMTP session (default: 50)
+    NEWSLETTER_RATE_PER_MINUTE  send ceiling across the campaign (default: 600)
+    NEWSLETTER_LEASE_SECONDS    how long a silent sender keeps the campaign (default: 300)
+    NEWSLETTER_TRIGGER_BATCHES  batches per /api/admin/newsletter/send call (default: 2)
+    NEWSLETTER_TRIGGER_TOKEN    secret that lets a scheduler call that endpoint without logging in
+"""
+import os
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask_mail import Message
+from markupsafe import escape
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from mail_templates import templates
+
+# Stand-ins rendered into the shared copy and swapped per subscriber
+NAME_TOKEN = '%%SUBSCRIBER_NAME%%'
+UNSUBSCRIBE_TOKEN = '%%UNSUBSCRIBE_URL%%'
+
+
+class NewsletterSender:
+    def __init__(self, app, mongo, mail, batch_size=50, rate_per_minute=600, lease_seconds=300, background=True):
+        self.app = app
+        self.mongo = mongo
+        self.mail = mail
+        self.batch_size = batch_size
+        self.rate_per_minute = rate_per_minute
+        self.lease = timedelta(seconds=lease_seconds)
+        self.owner = f"{os.getpid()}-{secrets.token_hex(4)}"
+        # Serverless functions can't keep a sender thread alive; their campaigns are sent
+        # through send_due() instead
+        self.background = background
+
+    @property
+    def subscribers(self):
+        return self.mongo.db.subscribers
+
+    @property
+    def campaigns(self):
+        return self.mongo.db.newsletter_campaigns
+
+    def ensure_indexes(self):
+        self.subscribers.create_index('email', unique=True)
+        self.subscribers.create_index('token', unique=True)
+        self.campaigns.create_index('blog_id', unique=True)
+        self.campaigns.create_index([('status', 1), ('lease_until', 1)])
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+    def subscribe(self, email, name=''):
+        """Add (or reactivate) a subscriber; returns True when they weren't already active."""
+        email = email.strip().lower()
+        now = datetime.now(timezone.utc)
+        previous = self.subscribers.find_one_and_update(
+            {'email': email},
+            {
+                '$set': {'status': 'active', 'name': name, 'updated_at': now},
+                '$setOnInsert': {'email': email, 'token': secrets.token_urlsafe(24), 'created_at': now}
+            },
+            upsert=True
+        )
+        return previous is None or previous.get('status') != 'active'
+
+    def unsubscribe(self, token):
+        result = self.subscribers.update_one(
+            {'token': token},
+            {'$set': {'status': 'unsubscribed', 'updated_at': datetime.now(timezone.utc)}}
+        )
+        return result.matched_count > 0
+
+    # ------------------------------------------------------------------
+    # Campaigns
+    # ------------------------------------------------------------------
+    def publish(self, blog, base_url):
+        """Start the fan-out for a newly published post. Returns the campaign id, or None if it already ran."""
+        base_url = base_url.rstrip('/')
+        rendered = templates.render(
+            'newsletter_post',
+            title=blog.title,
+            excerpt=blog.excerpt or '',
+            author=blog.author,
+            post_url=f"{base_url}/blog/{blog.slug}",
+            name=NAME_TOKEN,
+            unsubscribe_url=UNSUBSCRIBE_TOKEN
+        )
+        now = datetime.now(timezone.utc)
+        try:
+            campaign_id = self.campaigns.insert_one({
+                'blog_id': blog.id,
+                'subject': rendered.subject,
+                'text': rendered.text,
+                'html': rendered.html,
+                'base_url': base_url,
+                'status': 'pending',
+                'last_subscriber_id': None,
+                'sent': 0,
+                'failed': 0,
+                'created_at': now,
+                'updated_at': now
+            }).inserted_id
+        except DuplicateKeyError:
+            print(f"newsletter: post {blog.id} was already sent to subscribers")
+            return None
+        self.start(campaign_id)
+        return campaign_id
+
+    def start(self, campaign_id):
+        if not self.background:
+            print(f"newsletter: campaign {campaign_id} waits for /api/admin/newsletter/send")
+            return
+        threading.Thread(target=self.run, args=(campaign_id,), name=f'newsletter-{campaign_id}', daemon=True).start()
+
+    def resume(self):
+        """Restart campaigns whose sender died (lease expired) from their checkpoint."""
+        now = datetime.now(timezone.utc)
+        stalled = self.campaigns.find(
+            {'status': {'$in': ['pending', 'sending']},
+             '$or': [{'lease_until': None}, {'lease_until': {'$lte': now}}]},
+            {'_id': 1}
+        )
+        for campaign in stalled:
+            print(f"newsletter: resuming campaign {campaign['_id']}")
+            self.start(campaign['_id'])
+
+    def send_due(self, max_batches=2):
+        """Send up to `max_batches` batches of the oldest unfinished campaign nobody else is sending.
+
+        Returns the campaign's progress, or None when nothing is waiting.
+        """
+        now = datetime.now(timezone.utc)
+        campaign = self.campaigns.find_one(
+            {'status': {'$in': ['pending', 'sending']},
+             '$or': [{'lease_until': None}, {'lease_until': {'$lte': now}}]},
+            {'_id': 1},
+            sort=[('created_at', 1)]
+        )
+        if campaign is None:
+            return None
+        self._run(campaign['_id'], max_batches=max(1, max_batches))
+        progress = self.campaigns.find_one({'_id': campaign['_id']}, {'status': 1, 'sent': 1, 'failed': 1})
+        return {
+            'campaign_id': str(progress['_id']),
+            'status': progress['status'],
+            'sent': progress.get('sent', 0),
+            'failed': progress.get('failed', 0)
+        }
+
+    def run(self, campaign_id):
+        try:
+            with self.app.app_context():
+                self._run(campaign_id)
+        except Exception as e:
+            print(f"newsletter: campaign {campaign_id} stopped: {e}")
+            import traceback; traceback.print_exc()
+
+    def _claim(self, campaign_id):
+        now = datetime.now(timezone.utc)
+        return self.campaigns.find_one_and_update(
+            {'_id': campaign_id,
+             'status': {'$in': ['pending', 'sending']},
+             '$or': [{'lease_until': None}, {'lease_until': {'$lte': now}}, {'owner': self.owner}]},
+            {'$set': {'status': 'sending', 'owner': self.owner, 'lease_until': now + self.lease, 'updated_at': now}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _release(self, campaign_id):
+        """Give up the lease on an unfinished campaign so the next trigger can continue it."""
+        self.campaigns.update_one(
+            {'_id': campaign_id, 'owner': self.owner},
+            {'$set': {'lease_until': None, 'updated_at': datetime.now(timezone.utc)}}
+        )
+
+    def _run(self, campaign_id, max_batches=None):
+        """Send the campaign from its checkpoint; with `max_batches`, stop after that many batches."""
+        campaign = self._claim(campaign_id)
+        if campaign is None:
+            return  # finished, or another process is sending it
+        last_id = campaign.get('last_subscriber_id')
+        seconds_per_message = 60.0 / self.rate_per_minute if self.rate_per_minute > 0 else 0
+        session_failures = 0
+        batches = 0
+
+        while True:
+            query = {'status': 'active'}
+            if last_id is not None:
+                query['_id'] = {'$gt': last_id}
+            batch = list(self.subscribers.find(query, {'email': 1, 'name': 1, 'token': 1})
+                         .sort('_id', 1).limit(self.batch_size))
+            if not batch:
+                break
+
+            started = time.monotonic()
+            try:
+                errors = self.mail.send_many([self._personalize(campaign, subscriber) for subscriber in batch])
+            except Exception as e:
+                # Couldn't open an SMTP session at all; back off and retry this batch
+                session_failures += 1
+                print(f"newsletter: campaign {campaign_id} could not send batch ({e})")
+                if max_batches is not None:
+                    # Don't hold a request open backing off; the next trigger retries
+                    self._release(campaign_id)
+                    return
+                if session_failures >= 5:
+                    print(f"newsletter: giving up on campaign {campaign_id} until the next resume")
+                    return
+                time.sleep(30 * session_failures)
+                continue
+            session_failures = 0
+            failed = sum(1 for error in errors if error is not None)
+            for subscriber, error in zip(batch, errors):
+                if error is not None:
+                    print(f"newsletter: failed to send to {subscriber['email']}: {error}")
+            last_id = batch[-1]['_id']
+
+            # Checkpoint only while we still hold the lease
+            now = datetime.now(timezone.utc)
+            checkpoint = self.campaigns.update_one(
+                {'_id': campaign_id, 'owner': self.owner},
+                {'$set': {'last_subscriber_id': last_id, 'lease_until': now + self.lease, 'updated_at': now},
+                 '$inc': {'sent': len(batch) - failed, 'failed': failed}}
+            )
+            if checkpoint.matched_count == 0:
+                print(f"newsletter: lost the lease on campaign {campaign_id}; stopping")
+                return
+            batches += 1
+            if max_batches is not None and batches >= max_batches:
+                self._release(campaign_id)
+                return
+
+            # Stay under the rate ceiling
+            pause = len(batch) * seconds_per_message - (time.monotonic() - started)
+            if pause > 0:
+                time.sleep(pause)
+
+        self.campaigns.update_one(
+            {'_id': campaign_id, 'owner': self.owner},
+            {'$set': {'status': 'done', 'lease_until': None, 'finished_at': datetime.now(timezone.utc)}}
+        )
+        print(f"newsletter: campaign {campaign_id} finished")
+
+    def _personalize(self, campaign, subscriber):
+        name = subscriber.get('name') or 'there'
+        unsubscribe_url = f"{campaign['base_url']}/api/newsletter/unsubscribe?token={subscriber['token']}"
+        return Message(
+            campaign['subject'],
+            recipients=[subscriber['email']],
+            body=campaign['text'].replace(NAME_TOKEN, name).replace(UNSUBSCRIBE_TOKEN, unsubscribe_url),
+            html=campaign['html'].replace(NAME_TOKEN, str(escape(name))).replace(UNSUBSCRIBE_TOKEN, str(escape(unsubscribe_url)))
+        )
@@ -0,0 +1,251 @@
+"""
+Durable outbound email queue.
+
+Routes render their emails and `enqueue()` them into the `email_outbox`
+collection instead of talking to SMTP inside the request. A small pool of
+worker threads claims due messages, sends them, and records per-message
+delivery status. Failed sends are retried with exponential backoff. When a
+message belongs to a contact or meeting, the worker sets that record's
+`email_sent_user` / `email_sent_admin` flag once it is delivered.
+
+Serverless deployments can't keep worker threads alive after the response,
+so with `inline=True` each enqueued message is attempted right away in the
+request thread. A failed attempt is only retried when something calls
+`send_due()` (POST /api/admin/outbox/send, e.g. from a scheduled function) or
+when a process with workers picks it up.
+"""
+import os
+import threading
+import traceback
+from datetime import datetime, timedelta, timezone
+
+from flask_mail import Message
+from pymongo import ReturnDocument
+
+# Which record flag each audience's delivery sets
+AUDIENCE_FLAGS = {
+    'user': 'email_sent_user',
+    'admin': 'email_sent_admin'
+}
+
+
+def message_to_document(message):
+    return {
+        'subject': message.subject,
+        'sender': message.sender,
+        'recipients': list(message.recipients),
+        'cc': list(message.cc or []),
+        'bcc': list(message.bcc or []),
+        'reply_to': message.reply_to,
+        'body': message.body,
+        'html': message.html
+    }
+
+
+def document_to_message(doc):
+    sender = doc.get('sender')
+    return Message(
+        subject=doc.get('subject'),
+        sender=tuple(sender) if isinstance(sender, list) else sender,
+        recipients=doc.get('recipients'),
+        cc=doc.get('cc') or None,
+        bcc=doc.get('bcc') or None,
+        reply_to=doc.get('reply_to'),
+        body=doc.get('body'),
+        html=doc.get('html')
+    )
+
+
+class EmailOutbox:
+    def __init__(self, app=None, mongo=None, mail=None, workers=2, max_attempts=6, base_delay=30,
+                 poll_interval=5, lock_seconds=300, inline=False):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.poll_interval = poll_interval
+        self.lock_seconds = lock_seconds
+        self.inline = inline
+        self._wakeup = threading.Event()
+        self._threads = []
+        self._pid = None
+        self._start_lock = threading.Lock()
+        # Optional AdminDigest that admin notifications are parked in (see admin_digest.py)
+        self.digest = None
+        # Optional StatsRollup that counts finished deliveries (see stats.py)
+        self.stats = None
+        if app is not None:
+            self.init_app(app, mongo, mail)
+
+    def init_app(self, app, mongo, mail):
+        self.app = app
+        self.mongo = mongo
+        self.mail = mail
+
+    @property
+    def collection(self):
+        return self.mongo.db.email_outbox
+
+    def ensure_indexes(self):
+        self.collection.create_index([('status', 1), ('next_attempt_at', 1)])
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def enqueue(self, message, audience=None, record=None, records=None, digest=True):
+        """Queue `message` for delivery and return its outbox id.
+
+        `record` is an optional (collection name, _id) pair whose flag for `audience`
+        ('user' or 'admin') is set once the message is delivered; `records` takes a
+        list of {'collection', 'id'} dicts for messages covering several records.
+        Admin messages go to the digest instead when digest mode is on.
+        """
+        if digest and audience == 'admin' and self.digest is not None and self.digest.enabled:
+            return self.digest.add(message, record)
+        now = datetime.now(timezone.utc)
+        doc = message_to_document(message)
+        doc.update({
+            'audience': audience,
+            'status': 'pending',
+            'attempts': 0,
+            'next_attempt_at': now,
+            'created_at': now
+        })
+        if record is not None:
+            doc['record'] = {'collection': record[0], 'id': record[1]}
+        if records:
+            doc['records'] = records
+        outbox_id = self.collection.insert_one(doc).inserted_id
+        if self.inline:
+            claimed = self._claim({'_id': outbox_id})
+            if claimed:
+                self._deliver(claimed)
+        else:
+            self.start()
+            self._wakeup.set()
+        return outbox_id
+
+    def enqueue_all(self, messages, record=None):
+        """Queue a {'user': Message, 'admin': Message} mapping; missing recipients are skipped."""
+        return {audience: self.enqueue(message, audience, record)
+                for audience, message in messages.items() if message is not None}
+
+    def send(self, message):
+        """Flask-Mail compatible entry point so the mail helpers can enqueue directly."""
+        self.enqueue(message)
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+    def start(self):
+        """Start the worker pool in this process (no-op if already running here)."""
+        if self.inline or self.workers <= 0:
+            return
+        with self._start_lock:
+            # Threads don't survive a fork (e.g. gunicorn --preload), so track the owning pid
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._threads = [
+                threading.Thread(target=self._run, name=f'email-outbox-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    if self.digest is not None:
+                        self.digest.flush_due()
+                    while self.process_one():
+                        pass
+            except Exception as e:
+                print(f"outbox: worker error: {e}")
+                traceback.print_exc()
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def send_due(self, max_messages=50):
+        """Deliver up to `max_messages` due messages in the calling thread; returns how many were attempted."""
+        if self.digest is not None:
+            self.digest.flush_due()
+        attempted = 0
+        while attempted < max_messages and self.process_one():
+            attempted += 1
+        return attempted
+
+    def process_one(self):
+        """Claim and deliver one due message. Returns False when nothing is due."""
+        claimed = self._claim({})
+        if claimed is None:
+            return False
+        self._deliver(claimed)
+        return True
+
+    def _claim(self, extra_filter):
+        now = datetime.now(timezone.utc)
+        query = {
+            '$or': [
+                {'status': 'pending', 'next_attempt_at': {'$lte': now}},
+                # A worker that died mid-send leaves its lock to expire
+                {'status': 'sending', 'locked_until': {'$lte': now}}
+            ]
+        }
+        query.update(extra_filter)
+        return self.collection.find_one_and_update(
+            query,
+            {
+                '$set': {'status': 'sending', 'locked_until': now + timedelta(seconds=self.lock_seconds)},
+                '$inc': {'attempts': 1}
+            },
+            sort=[('next_attempt_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _deliver(self, doc):
+        try:
+            self.mail.send(document_to_message(doc))
+        except Exception as e:
+            self._failed(doc, e)
+            return False
+        now = datetime.now(timezone.utc)
+        self.collection.update_one(
+            {'_id': doc['_id']},
+            {'$set': {'status': 'sent', 'sent_at': now, 'last_error': None}, '$unset': {'locked_until': ''}}
+        )
+        self._set_record_flag(doc, True)
+        if self.stats is not None:
+            self.stats.email_finished(True)
+        return True
+
+    def _failed(self, doc, error):
+        attempts = doc.get('attempts', 1)
+        print(f"outbox: delivery of {doc['_id']} to {doc.get('recipients')} failed (attempt {attempts}): {error}")
+        update = {'last_error': str(error)}
+        if attempts >= self.max_attempts:
+            update['status'] = 'failed'
+            update['failed_at'] = datetime.now(timezone.utc)
+        else:
+            update['status'] = 'pending'
+            delay = self.base_delay * 2 ** (attempts - 1)
+            update['next_attempt_at'] = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        self.collection.update_one({'_id': doc['_id']}, {'$set': update, '$unset': {'locked_until': ''}})
+        if update['status'] == 'failed':
+            self._set_record_flag(doc, False)
+            if self.stats is not None:
+                self.stats.email_finished(False)
+
+    def _set_record_flag(self, doc, delivered):
+        records = doc.get('records') or ([doc['record']] if doc.get('record') else [])
+        flag = AUDIENCE_FLAGS.get(doc.get('audience'))
+        if not records or not flag:
+            return
+        update = {flag: delivered, 'updated_at': datetime.now(timezone.utc)}
+        if delivered:
+            update['email_sent'] = True
+        for record in records:
+            try:
+                self.mongo.db[record['collection']].update_one({'_id': record['id']}, {'$set': update})
+            except Exception as e:
+                print(f"outbox: failed to update {record['collection']} {record['id']} email flags: {e}")
@@ -0,0 +1,25 @@
+"""
+Rebuild the blog full-text index from the blog table.
+
+Run once after deploying full-text search, or whenever the index may be out of
+step with the posts (e.g. after editing posts directly in the database):
+
+    python rebuild_blog_search.py
+"""
+from app import app, blog_search, db
+from models import Blog
+
+
+def rebuild_blog_search():
+    with app.app_context():
+        db.create_all()
+        if not blog_search.enabled:
+            print("❌ Full-text search is not available for this database; nothing to rebuild")
+            return False
+        count = blog_search.rebuild(Blog.query.yield_per(200))
+        print(f"✅ Indexed {count} blog post(s) ({blog_search.dialect})")
+        return True
+
+
+if __name__ == '__main__':
+    rebuild_blog_search()
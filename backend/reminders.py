@@ -0,0 +1,288 @@
+"""
+Reminder emails before scheduled meetings.
+
+One node at a time holds the `reminders` lease in `scheduler_leases` and fires
+reminders; every other node just keeps trying to take the lease over. The
+leader keeps its upcoming reminders in a heap of (fire_at, meeting, offset)
+entries:
+
+* On taking the lease it loads the `scheduled` meetings in the look-ahead
+  window with one range query on meeting_datetime (served by the
+  unique_active_slot index).
+* As time passes the window slides forward; only the newly uncovered range is
+  queried.
+* Changes are picked up incrementally. Routes in this process call
+  `meeting_changed()` / `meeting_removed()`, and every tick the leader reads
+  meetings whose `updated_at` moved since the last poll, which covers writes
+  made by other processes. Outdated heap entries are not searched for; each
+  meeting carries a version number and stale entries are dropped when popped.
+
+Before sending, a reminder is claimed atomically by adding its key to the
+meeting's `reminders_sent`. The key includes the meeting time, so a
+rescheduled meeting gets fresh reminders, and a new leader never repeats one
+the previous leader already sent. The email itself goes through the durable
+outbox.
+
+Run embedded in the web process (REMINDERS_MODE=embedded, the default), or set
+REMINDERS_MODE=standalone on the web nodes and run `python reminders.py`
+as a separate process. REMINDERS_MODE=off disables reminders.
+
+Configuration (environment variables):
+    REMINDER_OFFSETS         minutes before the meeting, comma-separated (default: "1440,15")
+    REMINDER_GRACE_MINUTES   how late a missed reminder may still go out (default: 10)
+    REMINDER_TICK_SECONDS    longest sleep between checks (default: 30)
+    REMINDER_LEASE_SECONDS   leader lease length (default: 90)
+"""
+import heapq
+import os
+import secrets
+import threading
+from datetime import datetime, timedelta, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+from mail_templates import templates
+
+LEASE_NAME = 'reminders'
+
+
+def reminder_key(offset_minutes, meeting_datetime):
+    return f"{offset_minutes}@{meeting_datetime.isoformat()}"
+
+
+def lead_time(offset_minutes):
+    if offset_minutes % 1440 == 0:
+        days = offset_minutes // 1440
+        return 'tomorrow' if days == 1 else f'in {days} days'
+    if offset_minutes % 60 == 0:
+        hours = offset_minutes // 60
+        return f"in {hours} hour{'' if hours == 1 else 's'}"
+    return f"in {offset_minutes} minutes"
+
+
+class ReminderScheduler:
+    def __init__(self, app, mongo, outbox, schedule, offsets=(1440, 15), grace_minutes=10, tick_seconds=30,
+                 lease_seconds=90):
+        self.app = app
+        self.mongo = mongo
+        self.outbox = outbox
+        self.schedule = schedule
+        self.offsets = sorted(set(offsets), reverse=True)
+        self.grace = timedelta(minutes=grace_minutes)
+        self.tick = tick_seconds
+        self.lease = timedelta(seconds=lease_seconds)
+        self.owner = f"{os.getpid()}-{secrets.token_hex(4)}"
+        # Load meetings whose earliest reminder falls inside this look-ahead
+        self.window = timedelta(minutes=self.offsets[0]) + timedelta(seconds=tick_seconds * 2)
+
+        self.is_leader = False
+        self._heap = []
+        self._versions = {}
+        self._loaded_until = None
+        self._last_poll = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def ensure_indexes(self):
+        # Same key pattern as the delta-export index, so one index serves both
+        self.mongo.db.meetings.create_index([('updated_at', 1), ('_id', 1)])
+
+    # ------------------------------------------------------------------
+    # Hooks for meeting writes in this process
+    # ------------------------------------------------------------------
+    def meeting_changed(self, meeting):
+        """Re-arm reminders for a created/updated meeting document."""
+        if not self.is_leader:
+            return
+        with self._lock:
+            self._schedule_meeting(meeting, self.schedule.now())
+        self._wakeup.set()
+
+    def meeting_removed(self, meeting_id):
+        if not self.is_leader:
+            return
+        with self._lock:
+            self._versions.pop(meeting_id, None)
+
+    # ------------------------------------------------------------------
+    # Heap maintenance
+    # ------------------------------------------------------------------
+    def _schedule_meeting(self, meeting, now):
+        meeting_id = meeting['_id']
+        version = self._versions.get(meeting_id, 0) + 1
+        start = meeting.get('meeting_datetime')
+        if meeting.get('status') != 'scheduled' or not start or start <= now:
+            # Nothing to remind about; bumping the version retires any queued entries
+            self._versions[meeting_id] = version
+            return
+        if self._loaded_until is not None and start >= self._loaded_until + timedelta(minutes=self.offsets[0]):
+            # Beyond the loaded window; the sliding range query will pick it up
+            self._versions.pop(meeting_id, None)
+            return
+        self._versions[meeting_id] = version
+        sent = set(meeting.get('reminders_sent') or [])
+        for offset in self.offsets:
+            fire_at = start - timedelta(minutes=offset)
+            if reminder_key(offset, start) in sent or fire_at < now - self.grace:
+                continue
+            heapq.heappush(self._heap, (fire_at, meeting_id, offset, start, version))
+
+    def _load_range(self, start, end, now):
+        """Queue reminders for scheduled meetings starting in [start, end)."""
+        cursor = self.mongo.db.meetings.find(
+            {'status': 'scheduled', 'meeting_datetime': {'$gte': start, '$lt': end}},
+            {'meeting_datetime': 1, 'status': 1, 'reminders_sent': 1}
+        )
+        count = 0
+        with self._lock:
+            for meeting in cursor:
+                self._schedule_meeting(meeting, now)
+                count += 1
+            self._loaded_until = end
+        return count
+
+    def _poll_changes(self, now):
+        """Apply meetings written since the last poll (by any process)."""
+        polled_at = datetime.now(timezone.utc)
+        query = {'updated_at': {'$gte': self._last_poll}} if self._last_poll else None
+        if query is not None:
+            with self._lock:
+                for meeting in self.mongo.db.meetings.find(query, {'meeting_datetime': 1, 'status': 1, 'reminders_sent': 1}):
+                    self._schedule_meeting(meeting, now)
+        # Overlap slightly so a write racing the poll isn't missed (re-applying is harmless)
+        self._last_poll = polled_at - timedelta(seconds=1)
+
+    def _reset(self):
+        with self._lock:
+            self._heap = []
+            self._versions = {}
+            self._loaded_until = None
+            self._last_poll = None
+
+    # ------------------------------------------------------------------
+    # Leader election
+    # ------------------------------------------------------------------
+    def _hold_lease(self):
+        now = datetime.now(timezone.utc)
+        try:
+            self.mongo.db.scheduler_leases.find_one_and_update(
+                {'_id': LEASE_NAME, '$or': [{'expires_at': {'$lte': now}}, {'owner': self.owner}]},
+                {'$set': {'owner': self.owner, 'expires_at': now + self.lease, 'renewed_at': now}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            # Another node holds an unexpired lease
+            return False
+
+    def release(self):
+        self.mongo.db.scheduler_leases.delete_one({'_id': LEASE_NAME, 'owner': self.owner})
+        self.is_leader = False
+
+    # ------------------------------------------------------------------
+    # Firing
+    # ------------------------------------------------------------------
+    def run_once(self):
+        """One scheduler tick; returns seconds until the next one is needed."""
+        leader = self._hold_lease()
+        if not leader:
+            if self.is_leader:
+                print("reminders: lost the scheduler lease")
+                self._reset()
+            self.is_leader = False
+            return self.tick
+
+        now = self.schedule.now()
+        if not self.is_leader:
+            print("reminders: acquired the scheduler lease")
+            self._reset()
+            self._last_poll = datetime.now(timezone.utc)
+            self.is_leader = True
+            loaded = self._load_range(now, now + self.window, now)
+            print(f"reminders: loaded {loaded} upcoming meeting(s)")
+        else:
+            self._poll_changes(now)
+            if now + self.window > self._loaded_until:
+                self._load_range(self._loaded_until, now + self.window, now)
+
+        while True:
+            with self._lock:
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                fire_at, meeting_id, offset, start, version = heapq.heappop(self._heap)
+                if self._versions.get(meeting_id) != version:
+                    continue
+            self._fire(meeting_id, offset, start, now)
+
+        with self._lock:
+            next_due = self._heap[0][0] if self._heap else None
+        if next_due is None:
+            return self.tick
+        return max(0.0, min(self.tick, (next_due - now).total_seconds()))
+
+    def _fire(self, meeting_id, offset, start, now):
+        if now > start:
+            return
+        key = reminder_key(offset, start)
+        # Claim the reminder; fails if the meeting moved, was cancelled, or it was already sent
+        meeting = self.mongo.db.meetings.find_one_and_update(
+            {'_id': meeting_id, 'status': 'scheduled', 'meeting_datetime': start, 'reminders_sent': {'$ne': key}},
+            {'$addToSet': {'reminders_sent': key}}
+        )
+        if meeting is None:
+            return
+        try:
+            message = templates.message(
+                'meeting_reminder', [meeting.get('email')],
+                name=meeting.get('name'),
+                meeting_datetime=start,
+                meeting_link=meeting.get('meeting_link') or '',
+                lead=lead_time(offset),
+                duration=meeting.get('duration') or self.schedule.meeting_minutes
+            )
+            self.outbox.enqueue(message)
+            print(f"reminders: queued {offset}-minute reminder for meeting {meeting_id}")
+        except Exception as e:
+            # Give the claim back so the next tick (or leader) can retry
+            self.mongo.db.meetings.update_one({'_id': meeting_id}, {'$pull': {'reminders_sent': key}})
+            print(f"reminders: failed to queue reminder for meeting {meeting_id}: {e}")
+            with self._lock:
+                heapq.heappush(self._heap, (now + timedelta(seconds=self.tick), meeting_id, offset, start,
+                                            self._versions.get(meeting_id)))
+
+    # ------------------------------------------------------------------
+    # Threads
+    # ------------------------------------------------------------------
+    def run_forever(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    delay = self.run_once()
+            except Exception as e:
+                print(f"reminders: scheduler error: {e}")
+                import traceback; traceback.print_exc()
+                delay = self.tick
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+
+    def start(self):
+        """Run the scheduler on a daemon thread in this process (once per pid)."""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self.run_forever, name='meeting-reminders', daemon=True)
+        self._thread.start()
+
+
+if __name__ == '__main__':
+    # Standalone mode: keep the web workers from starting their own scheduler thread
+    os.environ['REMINDERS_MODE'] = 'standalone'
+    import app as web
+
+    print("reminders: running standalone")
+    try:
+        web.reminders.run_forever()
+    except KeyboardInterrupt:
+        web.reminders.release()
@@ -1,2 +1,3 @@
-﻿from app import app
+﻿from app import app, start_background
+start_background()
 app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
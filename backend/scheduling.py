@@ -0,0 +1,248 @@
+"""
+Booking schedule: business hours, holidays and time zone for the slot engine.
+
+Slot templates are precomputed once per weekday from the configuration, so
+rendering a day is a handful of string joins rather than per-slot datetime
+formatting. Meetings are stored as naive wall-clock times in the schedule's
+time zone (the format existing records use); every rendered slot also carries
+its UTC instant for clients in other time zones.
+
+Configuration (environment variables):
+    SCHEDULE_TIMEZONE      IANA zone, e.g. "Asia/Kolkata" (default: server local time)
+    SCHEDULE_HOURS         e.g. "mon-fri=09:00-17:00,sat=10:00-13:00"
+    SCHEDULE_SLOT_MINUTES  minutes between slot starts (default: 60)
+    SCHEDULE_HOLIDAYS      comma-separated blackout dates, e.g. "2025-12-25,2026-01-01"
+    SCHEDULE_HORIZON_DAYS  how many days ahead slots are offered (default: 90)
+    SCHEDULE_MAX_MEETING_MINUTES  longest meeting on record; bounds conflict lookups (default: 120)
+"""
+import os
+from bisect import bisect_left
+from datetime import datetime, date, time, timedelta
+from itertools import accumulate
+from zoneinfo import ZoneInfo
+
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+DEFAULT_HOURS = 'mon-fri=09:00-17:00'
+
+
+def parse_hours(spec):
+    """Parse "mon-fri=09:00-17:00,sat=10:00-13:00" into {weekday: (open, close)}."""
+    hours = {}
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        days, _, span = part.partition('=')
+        first, _, last = days.strip().lower().partition('-')
+        opens, _, closes = span.strip().partition('-')
+        start_idx = WEEKDAYS.index(first)
+        end_idx = WEEKDAYS.index(last) if last else start_idx
+        for weekday in range(start_idx, end_idx + 1):
+            hours[weekday] = (time.fromisoformat(opens), time.fromisoformat(closes))
+    return hours
+
+
+def free_bits(flags):
+    """Hex bitstring for a list of booleans: four per character, lowest bit first."""
+    return ''.join(
+        format(sum(1 << bit for bit, flag in enumerate(flags[i:i + 4]) if flag), 'x')
+        for i in range(0, len(flags), 4)
+    )
+
+
+class SlotTemplate:
+    """The slots offered on one weekday, as minute offsets from midnight plus labels."""
+
+    def __init__(self, index, opens, closes, step_minutes, meeting_minutes):
+        self.index = index
+        start = opens.hour * 60 + opens.minute
+        # The last slot must leave room for a full meeting before closing time
+        end = closes.hour * 60 + closes.minute - meeting_minutes
+        self.offsets = list(range(start, end + 1, step_minutes))
+        self.times = [f"{m // 60:02d}:{m % 60:02d}" for m in self.offsets]
+        self.labels = [f"{(m // 60 - 1) % 12 + 1:02d}:{m % 60:02d} {'AM' if m < 720 else 'PM'}" for m in self.offsets]
+
+    def to_dict(self):
+        return [{'time': t, 'label': label} for t, label in zip(self.times, self.labels)]
+
+
+class ConflictIndex:
+    """Busy intervals [start, end) answering overlap queries in O(log n).
+
+    Intervals are sorted by start and `max_end[i]` holds the latest end among the
+    first i + 1 of them. Everything starting before `end` is a prefix found by
+    bisection, and it overlaps [start, end) iff that prefix's max end is after `start`.
+    Correct for arbitrary (even overlapping) durations.
+    """
+
+    def __init__(self, intervals=()):
+        intervals = sorted(intervals)
+        self.starts = [start for start, _ in intervals]
+        self.max_end = list(accumulate((end for _, end in intervals), max))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlaps(self, start, end):
+        i = bisect_left(self.starts, end)
+        return i > 0 and self.max_end[i - 1] > start
+
+
+class Schedule:
+    def __init__(self, hours=None, step_minutes=60, meeting_minutes=30, holidays=(), tz_name=None, horizon_days=90,
+                 max_meeting_minutes=120):
+        self.hours = parse_hours(DEFAULT_HOURS) if hours is None else hours
+        self.step_minutes = step_minutes
+        self.meeting_minutes = meeting_minutes
+        self.max_meeting_minutes = max(meeting_minutes, max_meeting_minutes)
+        self.holidays = frozenset(holidays)
+        self.tz_name = tz_name
+        self.tz = ZoneInfo(tz_name) if tz_name else None
+        self.horizon_days = horizon_days
+
+        # One template per distinct opening span; weekdays with equal hours share it
+        self.templates = []
+        self._weekday_templates = {}
+        by_span = {}
+        for weekday, (opens, closes) in sorted(self.hours.items()):
+            if (opens, closes) not in by_span:
+                template = SlotTemplate(len(self.templates), opens, closes, step_minutes, meeting_minutes)
+                self.templates.append(template)
+                by_span[(opens, closes)] = template
+            self._weekday_templates[weekday] = by_span[(opens, closes)]
+
+    @classmethod
+    def from_env(cls, meeting_minutes=30):
+        holidays = [date.fromisoformat(d.strip()) for d in os.getenv('SCHEDULE_HOLIDAYS', '').split(',') if d.strip()]
+        return cls(
+            hours=parse_hours(os.getenv('SCHEDULE_HOURS', DEFAULT_HOURS)),
+            step_minutes=int(os.getenv('SCHEDULE_SLOT_MINUTES', '60')),
+            meeting_minutes=meeting_minutes,
+            holidays=holidays,
+            tz_name=os.getenv('SCHEDULE_TIMEZONE') or None,
+            horizon_days=int(os.getenv('SCHEDULE_HORIZON_DAYS', '90')),
+            max_meeting_minutes=int(os.getenv('SCHEDULE_MAX_MEETING_MINUTES', '120'))
+        )
+
+    def now(self):
+        """Current wall-clock time in the schedule's zone, naive like stored meetings."""
+        if self.tz is None:
+            return datetime.now()
+        return datetime.now(self.tz).replace(tzinfo=None)
+
+    def today(self):
+        return self.now().date()
+
+    def to_local(self, value):
+        """Convert an aware datetime to naive schedule-local time; naive values pass through."""
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(self.tz).replace(tzinfo=None)
+
+    def utc_offset(self, local_dt):
+        aware = local_dt.replace(tzinfo=self.tz) if self.tz else local_dt.astimezone()
+        return aware.utcoffset()
+
+    def meeting_interval(self, start, duration=None):
+        """The [start, end) span a meeting occupies; records without a duration use the default."""
+        return start, start + timedelta(minutes=duration or self.meeting_minutes)
+
+    def conflict_lookback(self, start):
+        """Earliest start of a meeting that could still be running at `start`."""
+        return start - timedelta(minutes=self.max_meeting_minutes)
+
+    def slots_overlapping(self, start, end):
+        """Offered slot starts whose meeting span overlaps [start, end), in order."""
+        slots = []
+        day = (start - timedelta(minutes=self.meeting_minutes)).date()
+        while day <= end.date():
+            template = self.template_for(day)
+            midnight = datetime.combine(day, time())
+            for minutes in (template.offsets if template else ()):
+                slot_start, slot_end = self.meeting_interval(midnight + timedelta(minutes=minutes))
+                if slot_start < end and slot_end > start:
+                    slots.append(slot_start)
+            day += timedelta(days=1)
+        return slots
+
+    def template_for(self, day):
+        if day in self.holidays:
+            return None
+        return self._weekday_templates.get(day.weekday())
+
+    def is_slot(self, local_dt):
+        """True when `local_dt` is an offered slot start inside the booking horizon."""
+        template = self.template_for(local_dt.date())
+        if template is None or local_dt.second or local_dt.microsecond:
+            return False
+        if not self.today() <= local_dt.date() < self.today() + timedelta(days=self.horizon_days):
+            return False
+        return local_dt.hour * 60 + local_dt.minute in template.offsets
+
+    def day_slots(self, day):
+        """Render the static part of every slot on `day` (no availability flags)."""
+        template = self.template_for(day)
+        if template is None:
+            return []
+        day_iso = day.isoformat()
+        day_name = day.strftime('%A')
+        day_short = day.strftime('%a')
+        display_prefix = day.strftime('%A, %B %d at ')
+        midnight = datetime.combine(day, time())
+
+        # A single offset covers the whole day unless it contains a DST transition
+        first = midnight + timedelta(minutes=template.offsets[0]) if template.offsets else midnight
+        last = midnight + timedelta(minutes=template.offsets[-1]) if template.offsets else midnight
+        day_offset = self.utc_offset(first)
+        if self.utc_offset(last) != day_offset:
+            day_offset = None
+
+        slots = []
+        for minutes, time_str, label in zip(template.offsets, template.times, template.labels):
+            slot_time = midnight + timedelta(minutes=minutes)
+            offset = day_offset if day_offset is not None else self.utc_offset(slot_time)
+            slots.append({
+                'slot_time': slot_time,
+                'datetime': f"{day_iso}T{time_str}:00",
+                'utc': (slot_time - offset).isoformat() + 'Z',
+                'display': display_prefix + label,
+                'date': day_iso,
+                'time': label,
+                'day': day_name,
+                'day_short': day_short
+            })
+        return slots
+
+    def compact_payload(self, days, conflicts):
+        """Encode availability as each template once plus a free-slot bitstring per open day.
+
+        A day's `free` is hex, four slots per character, lowest bit first: slot i of its
+        template is free when `int(free[i // 4], 16) >> (i % 4) & 1`. A string rather than
+        one integer keeps days of any length exact (JavaScript shifts are 32-bit and JSON
+        numbers lose precision past 2**53). `utc_offset` (minutes) turns the local template
+        times into UTC instants.
+        """
+        encoded = []
+        for day in days:
+            template = self.template_for(day)
+            if template is None:
+                continue
+            midnight = datetime.combine(day, time())
+            free = [
+                not conflicts.overlaps(*self.meeting_interval(midnight + timedelta(minutes=minutes)))
+                for minutes in template.offsets
+            ]
+            offset = self.utc_offset(midnight + timedelta(minutes=template.offsets[0])) if template.offsets else timedelta(0)
+            encoded.append({
+                'date': day.isoformat(),
+                'template': template.index,
+                'free': free_bits(free),
+                'utc_offset': int(offset.total_seconds() // 60)
+            })
+        return {
+            'format': 'compact',
+            'timezone': self.tz_name,
+            'templates': [template.to_dict() for template in self.templates],
+            'days': encoded
+        }
@@ -0,0 +1,100 @@
+"""
+In-process fan-out of slot availability changes to Server-Sent Events clients.
+
+Each connected client gets its own queue; `publish()` appends the event to a
+short replay history and pushes it to every queue, so it is safe to call from
+any request thread (gunicorn gthread workers included). Events only reach
+clients connected to the same process. Reconnecting clients send
+Last-Event-ID and get the events they missed from the history.
+
+Streams also run the optional `on_tick` callback at most once per heartbeat
+across the process. The app uses it to announce holds that lapsed on their own,
+since nothing else writes when a hold expires.
+
+Each open stream occupies a worker thread for up to `max_stream_seconds`, so
+serve the app with a threaded worker (gunicorn's gthread) and keep
+`max_clients` well below the thread count, leaving threads for ordinary
+requests. backend/gunicorn.conf.py sets this up. A sync worker would be held
+by a single stream.
+"""
+import json
+import queue
+import threading
+import time
+from collections import deque
+
+
+class SlotEventBroker:
+    def __init__(self, history=256, max_clients=100, heartbeat=15, max_stream_seconds=300, on_tick=None):
+        self.max_clients = max_clients
+        self.heartbeat = heartbeat
+        self.on_tick = on_tick
+        self._next_tick = 0
+        # Streams end after a while so long-lived connections don't pin worker threads;
+        # EventSource reconnects on its own and resumes from Last-Event-ID.
+        self.max_stream_seconds = max_stream_seconds
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=history)
+        self._last_id = 0
+
+    def publish(self, event, data):
+        with self._lock:
+            self._last_id += 1
+            message = (self._last_id, event, json.dumps(data, separators=(',', ':')))
+            self._history.append(message)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # A client that stopped reading is dropped; it will reconnect and replay
+                self.unsubscribe(subscriber)
+
+    def subscribe(self, last_event_id=None):
+        """Register a client, or return None when the process is at capacity."""
+        subscriber = queue.Queue(maxsize=self._history.maxlen)
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            if last_event_id is not None:
+                for message in self._history:
+                    if message[0] > last_event_id:
+                        subscriber.put_nowait(message)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def tick(self):
+        """Run `on_tick` if no stream has done so within the last heartbeat."""
+        if self.on_tick is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_tick:
+                return
+            self._next_tick = now + self.heartbeat
+        try:
+            self.on_tick()
+        except Exception as e:
+            print(f"slot events: tick failed: {e}")
+
+    def stream(self, subscriber):
+        """Yield SSE frames for `subscriber` until the stream's lifetime runs out."""
+        deadline = time.monotonic() + self.max_stream_seconds
+        try:
+            yield "retry: 3000\n\n"
+            while time.monotonic() < deadline:
+                self.tick()
+                try:
+                    event_id, event, data = subscriber.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
@@ -0,0 +1,203 @@
+"""
+Daily analytics rollup for the admin dashboard.
+
+`stats_daily` holds one document per day (`_id` 'YYYY-MM-DD'):
+
+    {'_id': '2026-03-01', 'date': datetime(2026, 3, 1),
+     'leads': 4,                                   # contacts received
+     'bookings': 2,                                # meetings requested
+     'status': {'pending': 1, 'scheduled': 1},     # current status of that day's bookings
+     'budget': {'5k-10k': 2},                      # budget / project type of that day's bookings
+     'project_type': {'web': 1, 'unspecified': 1},
+     'emails': {'sent': 7, 'failed': 0}}           # outbox deliveries that finished that day
+
+Contacts and meetings count on the day they were received. The write paths
+keep the rollup current with `$inc` upserts. Booking, contact and delete
+routes adjust the counts, and status changes move a booking from one status to
+the other on its booking day, so the rollup always describes the current data.
+`/api/admin/stats` only reads this collection.
+
+`rebuild()` recomputes the whole rollup from the source collections with one
+aggregation pipeline. The pipeline writes a scratch collection, which then
+replaces `stats_daily` in one rename. Run it once to backfill existing data
+with `python stats.py`, or again if the rollup ever drifts. Increments that
+land while a rebuild runs are lost, so run it at a quiet time.
+"""
+from datetime import datetime, timedelta, timezone
+
+DAY_FORMAT = '%Y-%m-%d'
+UNSPECIFIED = 'unspecified'
+BREAKDOWNS = ('status', 'budget', 'project_type', 'emails')
+REBUILD_COLLECTION = 'stats_daily_rebuild'
+
+
+def day_key(value):
+    return (value or datetime.now()).strftime(DAY_FORMAT)
+
+
+def bucket(value):
+    """A value usable as a field name in the rollup's breakdown maps."""
+    value = str(value).strip() if value is not None else ''
+    return value.replace('.', '_').replace('$', '_') or UNSPECIFIED
+
+
+class StatsRollup:
+    def __init__(self, mongo):
+        self.mongo = mongo
+
+    @property
+    def collection(self):
+        return self.mongo.db.stats_daily
+
+    def _inc(self, day, counts):
+        try:
+            self.collection.update_one(
+                {'_id': day},
+                {'$inc': counts, '$setOnInsert': {'date': datetime.strptime(day, DAY_FORMAT)}},
+                upsert=True
+            )
+        except Exception as e:
+            # Stats must never break the write path they ride on
+            print(f"stats: failed to update {day}: {e}")
+
+    # ------------------------------------------------------------------
+    # Write-path hooks
+    # ------------------------------------------------------------------
+    def contact_created(self, contact, delta=1):
+        self._inc(day_key(contact.get('timestamp')), {'leads': delta})
+
+    def contact_deleted(self, contact):
+        self.contact_created(contact, -1)
+
+    def meeting_created(self, meeting, delta=1):
+        self._inc(day_key(meeting.get('timestamp')), {
+            'bookings': delta,
+            f"status.{bucket(meeting.get('status') or 'pending')}": delta,
+            f"budget.{bucket(meeting.get('budget'))}": delta,
+            f"project_type.{bucket(meeting.get('project_type'))}": delta
+        })
+
+    def meeting_deleted(self, meeting):
+        self.meeting_created(meeting, -1)
+
+    def meeting_status_changed(self, meeting, new_status):
+        old_status = bucket(meeting.get('status') or 'pending')
+        new_status = bucket(new_status)
+        if old_status != new_status:
+            self._inc(day_key(meeting.get('timestamp')), {f'status.{old_status}': -1, f'status.{new_status}': 1})
+
+    def email_finished(self, delivered):
+        self._inc(datetime.now(timezone.utc).strftime(DAY_FORMAT), {f"emails.{'sent' if delivered else 'failed'}": 1})
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def summary(self, start, end):
+        """Totals for the days in [start, end] (dates), from the rollup alone."""
+        days = list(self.collection.find(
+            {'_id': {'$gte': start.strftime(DAY_FORMAT), '$lte': end.strftime(DAY_FORMAT)}}
+        ).sort('_id', 1))
+
+        def merge(field):
+            totals = {}
+            for day in days:
+                for key, count in (day.get(field) or {}).items():
+                    totals[key] = totals.get(key, 0) + count
+            return {key: count for key, count in sorted(totals.items(), key=lambda item: -item[1]) if count}
+
+        weeks = {}
+        for day in days:
+            week_start = day['date'] - timedelta(days=day['date'].weekday())
+            weeks[week_start] = weeks.get(week_start, 0) + day.get('bookings', 0)
+
+        emails = merge('emails')
+        finished = emails.get('sent', 0) + emails.get('failed', 0)
+        return {
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'leads_per_day': [{'date': day['_id'], 'leads': day.get('leads', 0)} for day in days],
+            'bookings_per_week': [{'week_start': week.strftime(DAY_FORMAT), 'bookings': count}
+                                  for week, count in sorted(weeks.items())],
+            'status': merge('status'),
+            'budget': merge('budget'),
+            'project_type': merge('project_type'),
+            'emails': {
+                'sent': emails.get('sent', 0),
+                'failed': emails.get('failed', 0),
+                'success_rate': round(emails.get('sent', 0) / finished, 4) if finished else None
+            }
+        }
+
+    # ------------------------------------------------------------------
+    # Backfill
+    # ------------------------------------------------------------------
+    def rebuild(self):
+        """Recompute the rollup from contacts, meetings and the email outbox in one pipeline."""
+
+        def day(field):
+            return {'$dateToString': {'format': DAY_FORMAT, 'date': {'$ifNull': [field, {'$toDate': '$_id'}]}}}
+
+        def bucket_expr(field):
+            text = {'$trim': {'input': {'$toString': {'$ifNull': [field, '']}}}}
+            text = {'$replaceAll': {'input': text, 'find': '.', 'replacement': '_'}}
+            text = {'$replaceAll': {'input': text, 'find': {'$literal': '$'}, 'replacement': '_'}}
+            return {'$cond': [{'$eq': [text, '']}, UNSPECIFIED, text]}
+
+        def counted(field, key=None):
+            return {'f': field, 'k': key}
+
+        rollup = {
+            'date': {'$dateFromString': {'dateString': '$_id', 'format': DAY_FORMAT}},
+            'leads': 1,
+            'bookings': 1
+        }
+        for field in BREAKDOWNS:
+            rollup[field] = {'$arrayToObject': {'$map': {
+                'input': {'$filter': {'input': '$pairs', 'cond': {'$eq': ['$$this.f', field]}}},
+                'in': {'k': '$$this.k', 'v': '$$this.v'}
+            }}}
+
+        pipeline = [
+            # One row per counted event: (day, metric, breakdown key)
+            {'$project': {'_id': 0, 'day': day('$timestamp'), 'events': [counted('leads')]}},
+            {'$unionWith': {'coll': 'meetings', 'pipeline': [
+                {'$project': {'_id': 0, 'day': day('$timestamp'), 'events': [
+                    counted('bookings'),
+                    counted('status', bucket_expr({'$ifNull': ['$status', 'pending']})),
+                    counted('budget', bucket_expr('$budget')),
+                    counted('project_type', bucket_expr('$project_type'))
+                ]}}
+            ]}},
+            {'$unionWith': {'coll': 'email_outbox', 'pipeline': [
+                {'$match': {'status': {'$in': ['sent', 'failed']}}},
+                {'$project': {'_id': 0, 'day': day({'$ifNull': ['$sent_at', '$failed_at']}),
+                              'events': [counted('emails', '$status')]}}
+            ]}},
+            {'$unwind': '$events'},
+            {'$group': {'_id': {'day': '$day', 'f': '$events.f', 'k': '$events.k'}, 'n': {'$sum': 1}}},
+            # Fold each day's rows into one rollup document
+            {'$group': {
+                '_id': '$_id.day',
+                'leads': {'$sum': {'$cond': [{'$eq': ['$_id.f', 'leads']}, '$n', 0]}},
+                'bookings': {'$sum': {'$cond': [{'$eq': ['$_id.f', 'bookings']}, '$n', 0]}},
+                'pairs': {'$push': {'f': '$_id.f', 'k': '$_id.k', 'v': '$n'}}
+            }},
+            {'$project': rollup},
+            {'$out': REBUILD_COLLECTION}
+        ]
+        db = self.mongo.db
+        db.contacts.aggregate(pipeline)
+        if REBUILD_COLLECTION in db.list_collection_names():
+            db[REBUILD_COLLECTION].rename('stats_daily', dropTarget=True)
+        else:
+            # Nothing to count at all
+            self.collection.delete_many({})
+        days = self.collection.count_documents({})
+        print(f"stats: rebuilt {days} day(s)")
+        return days
+
+
+if __name__ == '__main__':
+    from app import stats
+
+    stats.rebuild()
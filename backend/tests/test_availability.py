@@ -0,0 +1,66 @@
+from datetime import date, datetime, timedelta
+
+import availability
+from availability import AvailabilityCache
+from scheduling import Schedule
+
+
+def window(day):
+    return (day, day + timedelta(days=1), 'verbose')
+
+
+def test_put_is_dropped_when_a_booking_invalidated_during_the_rebuild():
+    cache = AvailabilityCache(Schedule())
+    key = window(date(2030, 1, 7))
+    generation = cache.generation
+    # A booking lands in the window after the rebuild read the meetings
+    cache.invalidate(datetime(2030, 1, 7, 10))
+
+    entry = cache.put(key, {'slots': []}, generation)
+
+    assert entry.body == '{"slots":[]}'
+    assert cache.get(key) is None
+    stored = cache.put(key, {'slots': []}, cache.generation)
+    assert cache.get(key) is stored
+
+
+def test_invalidate_only_drops_windows_containing_the_day():
+    cache = AvailabilityCache(Schedule())
+    monday, tuesday = window(date(2030, 1, 7)), window(date(2030, 1, 8))
+    cache.put(monday, {}, cache.generation)
+    cache.put(tuesday, {}, cache.generation)
+
+    cache.invalidate(datetime(2030, 1, 8, 9))
+
+    assert cache.get(monday) is not None
+    assert cache.get(tuesday) is None
+
+
+def test_least_recently_used_window_is_evicted_past_the_cap():
+    cache = AvailabilityCache(Schedule(), max_windows=2)
+    first, second, third = (window(date(2030, 1, d)) for d in (7, 8, 9))
+    cache.put(first, {}, cache.generation)
+    cache.put(second, {}, cache.generation)
+    cache.get(first)
+
+    cache.put(third, {}, cache.generation)
+
+    assert cache.get(second) is None
+    assert cache.get(first) is not None
+    assert cache.get(third) is not None
+
+
+def test_expired_windows_are_removed(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(availability.time, 'monotonic', lambda: now[0])
+    cache = AvailabilityCache(Schedule(), ttl=30)
+    stale, fresh = window(date(2030, 1, 7)), window(date(2030, 1, 8))
+    cache.put(stale, {}, cache.generation)
+
+    now[0] += 31
+    cache.put(fresh, {}, cache.generation)
+
+    assert list(cache._windows) == [fresh]
+    now[0] += 31
+    assert cache.get(fresh) is None
+    assert not cache._windows
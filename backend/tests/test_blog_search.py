@@ -0,0 +1,91 @@
+import pytest
+from flask import Flask
+
+from blog_search import BlogSearch, fts5_query, html_text
+from models import Blog, db
+
+
+@pytest.fixture
+def search():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        blog_search = BlogSearch(db)
+        assert blog_search.setup()
+        yield blog_search
+        db.session.remove()
+
+
+def publish(search, title, content, excerpt=''):
+    blog = Blog(title=title, slug=title.lower().replace(' ', '-'), content=content, excerpt=excerpt)
+    db.session.add(blog)
+    db.session.flush()
+    search.index(blog)
+    db.session.commit()
+    return blog
+
+
+def found(search, query):
+    matches = search.matches(query)
+    if matches is None:
+        return []
+    rows = db.session.query(Blog.title).join(matches, Blog.id == matches.c.blog_id).order_by(matches.c.rank)
+    return [title for (title,) in rows]
+
+
+def test_title_matches_rank_above_content_matches(search):
+    publish(search, 'Cooking at home', '<p>Notes on <b>scheduling</b> dinner.</p>')
+    publish(search, 'Scheduling meetings', '<p>Calendars.</p>')
+
+    assert found(search, 'scheduling') == ['Scheduling meetings', 'Cooking at home']
+
+
+def test_edits_and_deletes_keep_the_index_in_sync(search):
+    blog = publish(search, 'Launch notes', '<p>Old wording about rockets.</p>')
+
+    blog.content = '<p>New wording about satellites.</p>'
+    search.index(blog)
+    db.session.commit()
+    assert found(search, 'rockets') == []
+    assert found(search, 'satellites') == ['Launch notes']
+
+    search.remove(blog.id)
+    db.session.delete(blog)
+    db.session.commit()
+    assert found(search, 'satellites') == []
+
+
+def test_rolled_back_write_leaves_no_index_entry(search):
+    blog = Blog(title='Draft', slug='draft', content='<p>unpublished idea</p>')
+    db.session.add(blog)
+    db.session.flush()
+    search.index(blog)
+    db.session.rollback()
+
+    assert found(search, 'unpublished') == []
+
+
+def test_rebuild_reindexes_every_post(search):
+    publish(search, 'First post', '<p>alpha</p>')
+    publish(search, 'Second post', '<p>beta</p>')
+    db.session.execute(db.text('DELETE FROM blog_fts'))
+    db.session.commit()
+
+    assert search.rebuild(Blog.query.all()) == 2
+    assert found(search, 'beta') == ['Second post']
+
+
+def test_snippets_escape_html_and_mark_matches(search):
+    blog = publish(search, 'Tags', '<p>Use &lt;script&gt; tags with care</p>')
+
+    snippet = search.snippets('care', [blog.id])[blog.id]
+    assert '<mark>care</mark>' in snippet
+    assert '<script>' not in snippet
+
+
+def test_user_input_is_reduced_to_quoted_terms():
+    assert fts5_query('c++ "OR" NEAR(x') == '"c" "OR" "NEAR" "x"*'
+    assert fts5_query('!!') is None
+    assert html_text('<p>a<script>evil()</script> <i>b</i></p>') == 'a b'
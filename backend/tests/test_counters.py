@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import mongomock
+
+from counters import CollectionCounters
+
+
+def make_counters(**kwargs):
+    mongo = SimpleNamespace(db=mongomock.MongoClient().db)
+    return CollectionCounters(mongo, **kwargs)
+
+
+def test_missing_counter_falls_back_to_an_estimate():
+    counters = make_counters()
+    counters.mongo.db.contacts.insert_many([{'n': i} for i in range(3)])
+    assert counters.total('contacts') == (3, False)
+
+
+def test_first_total_reconciles_and_later_ones_use_the_counter():
+    counters = make_counters()
+    db = counters.mongo.db
+    db.contacts.insert_many([{'n': i} for i in range(3)])
+    counters.seed('contacts')
+
+    assert counters.total('contacts') == (3, True)
+    db.contacts.insert_one({'n': 3})
+    counters.changed('contacts', 1)
+    # A write that skipped changed() drifts the counter until the next reconcile
+    db.contacts.insert_one({'n': 4})
+    assert counters.total('contacts') == (4, False)
+
+
+def test_drift_is_corrected_once_the_interval_passes():
+    counters = make_counters(reconcile_seconds=600)
+    db = counters.mongo.db
+    counters.seed('meetings')
+    counters.total('meetings')
+    db.meetings.insert_many([{'n': i} for i in range(2)])
+    assert counters.total('meetings') == (0, False)
+
+    stale = datetime.now(timezone.utc) - timedelta(seconds=601)
+    db.counters.update_one({'_id': 'meetings'}, {'$set': {'reconciled_at': stale}})
+    assert counters.total('meetings') == (2, True)
+    assert counters.total('meetings') == (2, False)
+
+
+def test_only_one_caller_claims_a_reconcile():
+    counters = make_counters()
+    counters.seed('contacts')
+    counter = counters.counters.find_one({'_id': 'contacts'})
+    assert counters._claim_reconcile('contacts', counter)
+    # A second caller holding the same snapshot loses the conditional update
+    assert not counters._claim_reconcile('contacts', counter)
+
+
+def test_filtered_counts_are_cached_until_a_write():
+    counters = make_counters()
+    calls = []
+
+    def count():
+        calls.append(1)
+        return 7
+
+    assert counters.filtered('contacts', {'name': 'a'}, count) == (7, True)
+    assert counters.filtered('contacts', {'name': 'a'}, count) == (7, False)
+    assert len(calls) == 1
+    counters.changed('contacts', 0)
+    assert counters.filtered('contacts', {'name': 'a'}, count) == (7, True)
+    assert len(calls) == 2
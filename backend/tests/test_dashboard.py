@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+
+from counters import CollectionCounters
+from dashboard import MAX_PAGE, DashboardService, decode_cursor, text_terms
+
+
+@pytest.fixture
+def service():
+    mongo = SimpleNamespace(db=mongomock.MongoClient().db)
+    start = datetime(2030, 1, 1, 9)
+    # Two contacts share each timestamp, so paging has to break ties on _id
+    mongo.db.contacts.insert_many([
+        {'name': f'c{i}', 'email': f'c{i}@example.com', 'timestamp': start + timedelta(hours=i // 2)}
+        for i in range(7)
+    ])
+    return DashboardService(mongo, CollectionCounters(mongo), per_page=2)
+
+
+def names(payload):
+    return [contact['name'] for contact in payload['contacts']]
+
+
+def test_next_cursors_walk_every_contact_once_newest_first(service):
+    payload = service.load()
+    seen = names(payload)
+    while payload['contacts_pagination']['next_cursor']:
+        payload = service.load(cursor=payload['contacts_pagination']['next_cursor'])
+        assert payload['contacts_pagination']['page'] is None
+        seen += names(payload)
+
+    assert sorted(seen) == [f'c{i}' for i in range(7)]
+    assert len(seen) == 7
+    assert seen[0] == 'c6'
+
+
+def test_prev_cursor_returns_the_page_before(service):
+    first = service.load()
+    second = service.load(cursor=first['contacts_pagination']['next_cursor'])
+    back = service.load(cursor=second['contacts_pagination']['prev_cursor'])
+
+    assert names(back) == names(first)
+    assert back['contacts_pagination']['prev_cursor'] is None
+
+
+def test_page_numbers_past_max_page_are_rejected(service):
+    assert service.load(page=MAX_PAGE)['contacts'] == []
+    with pytest.raises(ValueError):
+        service.load(page=MAX_PAGE + 1)
+    with pytest.raises(ValueError):
+        service.load(meetings_page=MAX_PAGE + 1)
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor('garbage')
+
+
+def test_text_terms_drop_phrase_and_negation_operators():
+    assert text_terms('"acme corp" -spam') == 'acme corp spam'
+    assert text_terms('  -- "" ') == ''
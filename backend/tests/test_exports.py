@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+
+import mongomock
+import pytest
+from bson import ObjectId
+
+from exports import CONTACTS, TOMBSTONES, decode_watermark, delta_page, record_deleted
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().db
+
+
+def add_contact(db, name, minutes_ago):
+    updated_at = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    return db.contacts.insert_one({'name': name, 'email': f'{name}@example.com', 'updated_at': updated_at}).inserted_id
+
+
+def page(db, since=None, limit=1000):
+    return delta_page(db.contacts, CONTACTS, fields='name', since=since, limit=limit, tombstones=db[TOMBSTONES])
+
+
+def test_watermark_resumes_after_the_last_record_of_a_page(db):
+    for i, name in enumerate(['ann', 'bob', 'cid']):
+        add_contact(db, name, minutes_ago=10 - i)
+
+    first = page(db, limit=2)
+    assert [r['name'] for r in first['records']] == ['ann', 'bob']
+    assert first['has_more']
+
+    second = page(db, since=first['watermark'], limit=2)
+    assert [r['name'] for r in second['records']] == ['cid']
+    assert not second['has_more']
+
+    # Nothing new: the watermark is handed back unchanged
+    third = page(db, since=second['watermark'])
+    assert third['records'] == [] and third['watermark'] == second['watermark']
+
+
+def test_records_sharing_a_timestamp_are_ordered_by_id(db):
+    same = datetime.now(timezone.utc) - timedelta(minutes=5)
+    ids = sorted(ObjectId() for _ in range(3))
+    db.contacts.insert_many([{'_id': oid, 'name': str(i), 'updated_at': same} for i, oid in enumerate(ids)])
+
+    first = page(db, limit=1)
+    rest = page(db, since=first['watermark'])
+    assert [r['id'] for r in first['records'] + rest['records']] == [str(oid) for oid in ids]
+
+
+def test_unsettled_writes_are_held_back(db):
+    add_contact(db, 'old', minutes_ago=5)
+    db.contacts.insert_one({'name': 'new', 'updated_at': datetime.now(timezone.utc)})
+
+    assert [r['name'] for r in page(db)['records']] == ['old']
+
+
+def test_deletes_come_out_as_tombstones_in_order(db):
+    kept = add_contact(db, 'kept', minutes_ago=10)
+    gone = add_contact(db, 'gone', minutes_ago=9)
+    synced = page(db)['watermark']
+
+    db.contacts.delete_one({'_id': gone})
+    record_deleted(db, CONTACTS, [gone])
+    db[TOMBSTONES].update_many({}, {'$set': {'updated_at': datetime.now(timezone.utc) - timedelta(minutes=1)}})
+    db.contacts.update_one({'_id': kept}, {'$set': {'updated_at': datetime.now(timezone.utc) - timedelta(seconds=30)}})
+
+    records = page(db, since=synced)['records']
+    assert [(r['id'], r['deleted']) for r in records] == [(str(gone), True), (str(kept), False)]
+    assert 'name' not in records[0]
+
+
+def test_malformed_watermark_is_rejected():
+    with pytest.raises(ValueError):
+        decode_watermark('not-a-watermark')
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import mongomock
+from flask import Flask
+from flask_mail import Message
+
+from outbox import EmailOutbox
+
+
+class FakeMail:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+
+    def send(self, message):
+        if self.failures:
+            self.failures -= 1
+            raise OSError('SMTP timeout')
+        self.sent.append(message)
+
+
+def make_outbox(mail, **kwargs):
+    mongo = SimpleNamespace(db=mongomock.MongoClient().db)
+    return EmailOutbox(Flask(__name__), mongo, mail, inline=True, base_delay=30, **kwargs)
+
+
+def message():
+    return Message(subject='Hello', sender='site@example.com', recipients=['visitor@example.com'], body='Hi')
+
+
+def until(moment):
+    # mongomock hands datetimes back as naive UTC
+    return moment - datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def make_due(outbox, outbox_id):
+    outbox.collection.update_one({'_id': outbox_id}, {'$set': {'next_attempt_at': datetime.now(timezone.utc)}})
+
+
+def test_failed_inline_send_backs_off_exponentially():
+    outbox = make_outbox(FakeMail(failures=2))
+    outbox_id = outbox.enqueue(message())
+    doc = outbox.collection.find_one({'_id': outbox_id})
+    assert doc['status'] == 'pending' and doc['attempts'] == 1
+    assert timedelta(seconds=25) < until(doc['next_attempt_at']) <= timedelta(seconds=30)
+
+    # Not due yet, so the drain leaves it alone
+    assert outbox.send_due() == 0
+
+    make_due(outbox, outbox_id)
+    assert outbox.send_due() == 1
+    doc = outbox.collection.find_one({'_id': outbox_id})
+    assert doc['attempts'] == 2
+    assert timedelta(seconds=55) < until(doc['next_attempt_at']) <= timedelta(seconds=60)
+
+    make_due(outbox, outbox_id)
+    assert outbox.send_due() == 1
+    doc = outbox.collection.find_one({'_id': outbox_id})
+    assert doc['status'] == 'sent' and doc['attempts'] == 3
+    assert len(outbox.mail.sent) == 1
+
+
+def test_message_is_marked_failed_after_max_attempts():
+    outbox = make_outbox(FakeMail(failures=5), max_attempts=2)
+    outbox_id = outbox.enqueue(message())
+    make_due(outbox, outbox_id)
+    outbox.send_due()
+
+    doc = outbox.collection.find_one({'_id': outbox_id})
+    assert doc['status'] == 'failed' and doc['attempts'] == 2
+    make_due(outbox, outbox_id)
+    assert outbox.send_due() == 0
+
+
+def test_claim_skips_messages_locked_by_another_sender():
+    outbox = make_outbox(FakeMail())
+    now = datetime.now(timezone.utc)
+    locked = outbox.collection.insert_one({'status': 'sending', 'attempts': 1, 'next_attempt_at': now,
+                                           'locked_until': now + timedelta(minutes=5)}).inserted_id
+    abandoned = outbox.collection.insert_one({'status': 'sending', 'attempts': 1, 'next_attempt_at': now,
+                                              'locked_until': now - timedelta(seconds=1)}).inserted_id
+
+    claimed = outbox._claim({})
+
+    assert claimed['_id'] == abandoned
+    assert claimed['attempts'] == 2
+    assert outbox._claim({}) is None
+    assert outbox.collection.find_one({'_id': locked})['attempts'] == 1
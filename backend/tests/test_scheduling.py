@@ -0,0 +1,70 @@
+from datetime import date, datetime, time, timedelta
+
+from scheduling import ConflictIndex, Schedule, free_bits, parse_hours
+
+
+def is_free(free, i):
+    # Same decoding as the booking page (react-frontend/src/services/api.js isSlotFree)
+    return int(free[i // 4], 16) >> (i % 4) & 1 == 1
+
+
+def long_day_schedule():
+    # 08:00-18:00 every 15 minutes: 39 slots, more than a 32-bit mask holds
+    return Schedule(hours=parse_hours('mon-sun=08:00-18:00'), step_minutes=15, meeting_minutes=30)
+
+
+def test_free_bits_packs_four_slots_per_hex_digit():
+    assert free_bits([]) == ''
+    assert free_bits([True, False, False, False]) == '1'
+    assert free_bits([False, False, False, True, True]) == '81'
+    assert free_bits([True] * 8) == 'ff'
+
+
+def test_compact_payload_round_trips_days_with_more_than_32_slots():
+    schedule = long_day_schedule()
+    day = date(2030, 1, 7)
+    midnight = datetime.combine(day, time())
+    # One meeting at 16:00 blocks the 15:45, 16:00 and 16:15 slots (indexes 31, 32, 33)
+    busy = ConflictIndex([schedule.meeting_interval(midnight + timedelta(hours=16))])
+
+    payload = schedule.compact_payload([day], busy)
+
+    template = payload['templates'][payload['days'][0]['template']]
+    assert len(template) == 39
+    free = payload['days'][0]['free']
+    taken = [i for i in range(len(template)) if not is_free(free, i)]
+    assert taken == [31, 32, 33]
+    assert [template[i]['time'] for i in taken] == ['15:45', '16:00', '16:15']
+
+
+def test_compact_payload_skips_closed_days():
+    schedule = Schedule(hours=parse_hours('mon-fri=09:00-17:00'))
+    saturday = date(2030, 1, 5)
+    assert schedule.compact_payload([saturday], ConflictIndex())['days'] == []
+
+
+def at(hour, minute=0):
+    return datetime(2030, 1, 7, hour, minute)
+
+
+def test_conflict_index_treats_intervals_as_half_open():
+    index = ConflictIndex([(at(10), at(11))])
+    assert index.overlaps(at(10, 30), at(10, 45))
+    assert index.overlaps(at(9, 30), at(10, 30))
+    assert not index.overlaps(at(11), at(12))
+    assert not index.overlaps(at(9), at(10))
+    assert not ConflictIndex().overlaps(at(9), at(10))
+
+
+def test_conflict_index_finds_a_long_meeting_hidden_behind_shorter_ones():
+    # The 09:00 meeting runs to 13:00, past the later short ones that start before 12:00
+    index = ConflictIndex([(at(10), at(10, 30)), (at(9), at(13)), (at(11), at(11, 30))])
+    assert index.overlaps(at(12), at(12, 30))
+    assert not index.overlaps(at(13), at(14))
+    assert len(index) == 3
+
+
+def test_meeting_interval_uses_the_records_duration():
+    schedule = Schedule(meeting_minutes=30)
+    assert schedule.meeting_interval(at(10)) == (at(10), at(10, 30))
+    assert schedule.meeting_interval(at(10), 90) == (at(10), at(11, 30))
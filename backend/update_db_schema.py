@@ -1,8 +1,15 @@
 """
-Script to update existing database records with the new company_url field
+Script to update existing database records with new fields:
+- company_url on meetings
+- updated_at on contacts and meetings (needed by the delta export)
+
+It also reports meetings that share a slot while active, which block the
+unique_active_slot index until one of each pair is cancelled or moved, and
+exits non-zero while any remain so a deploy step running it stops there.
 """
-from app import app, mongo
-from datetime import datetime
+import sys
+
+from app import app, mongo, ACTIVE_MEETING_STATUSES
 
 def update_meetings_schema():
     """Add company_url field to existing meeting records"""
@@ -37,11 +44,62 @@ def update_meetings_schema():
             traceback.print_exc()
             return False
 
+def backfill_updated_at():
+    """Give records written before updated_at existed one, taken from their _id's creation time"""
+    with app.app_context():
+        try:
+            for name in ('contacts', 'meetings'):
+                result = mongo.db[name].update_many(
+                    {"updated_at": {"$exists": False}},
+                    [{"$set": {"updated_at": {"$toDate": "$_id"}}}]
+                )
+                print(f"✅ Backfilled updated_at on {result.modified_count} {name} records")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error backfilling updated_at: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+def report_duplicate_slots():
+    """List active meetings booked into the same slot; returns False if any exist"""
+    with app.app_context():
+        try:
+            duplicates = list(mongo.db.meetings.aggregate([
+                {"$match": {"status": {"$in": ACTIVE_MEETING_STATUSES}}},
+                {"$group": {
+                    "_id": "$meeting_datetime",
+                    "meetings": {"$push": {"id": "$_id", "name": "$name", "email": "$email", "status": "$status"}},
+                    "count": {"$sum": 1}
+                }},
+                {"$match": {"count": {"$gt": 1}}},
+                {"$sort": {"_id": 1}}
+            ]))
+            if not duplicates:
+                print("✅ No slot has more than one active meeting")
+                return True
+
+            print(f"⚠️  {len(duplicates)} slot(s) have more than one active meeting.")
+            print("   Cancel or reschedule all but one in each slot, then restart the app to build the unique slot index:")
+            for slot in duplicates:
+                print(f"  - {slot['_id']}")
+                for meeting in slot['meetings']:
+                    print(f"    {meeting['id']}  {meeting.get('name')} ({meeting.get('email')})  {meeting.get('status')}")
+            return False
+
+        except Exception as e:
+            print(f"❌ Error checking for duplicate slots: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
 if __name__ == '__main__':
     print("🔄 Starting database schema update...\n")
-    success = update_meetings_schema()
+    success = update_meetings_schema() and backfill_updated_at() and report_duplicate_slots()
     
     if success:
         print("\n✅ Database update completed successfully!")
     else:
         print("\n❌ Database update failed. Please check the error messages above.")
+        sys.exit(1)
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { apiService } from '../services/api';
-import { API_ENDPOINTS } from '../utils/constants';
+import { API_BASE_URL, API_ENDPOINTS } from '../utils/constants';
 import Modal from '../components/common/Modal';
 import Loader from '../components/common/Loader';
 import styles from './Booking.module.css';
@@ -13,6 +13,7 @@ const Booking = () => {
     const [slots, setSlots] = useState([]);
     const [loading, setLoading] = useState(true);
     const [selectedSlot, setSelectedSlot] = useState(null);
+    const [holdToken, setHoldToken] = useState(null);
     const [formData, setFormData] = useState({
         name: '',
         email: '',
@@ -42,6 +43,22 @@ const Booking = () => {
         };
     }, []);
 
+    // Apply live slot-taken / slot-freed deltas instead of re-fetching the whole calendar.
+    // Serverless backends answer 204, which closes the EventSource for good.
+    useEffect(() => {
+        if (typeof EventSource === 'undefined') return undefined;
+        const source = new EventSource(`${API_BASE_URL}${API_ENDPOINTS.SLOT_EVENTS}`);
+        const applyDelta = (available) => (event) => {
+            const changed = new Set(JSON.parse(event.data).slots);
+            setSlots((current) => current.map((slot) => (
+                changed.has(slot.datetime) ? { ...slot, available, booked: !available } : slot
+            )));
+        };
+        source.addEventListener('slot-taken', applyDelta(false));
+        source.addEventListener('slot-freed', applyDelta(true));
+        return () => source.close();
+    }, []);
+
     const fetchSlots = async (attempt = 1, maxAttempts = 3) => {
         setLoading(true);
         try {
@@ -92,9 +109,28 @@ const Booking = () => {
         }
     };
 
-    const handleSlotClick = (slot) => {
-        if (slot.available) {
-            setSelectedSlot(slot);
+    const handleSlotClick = async (slot) => {
+        if (!slot.available) return;
+        setSelectedSlot(slot);
+        try {
+            // Hold the slot so other visitors don't see it as free while this form is filled in
+            const hold = await apiService.holdSlot(slot.datetime, holdToken);
+            setHoldToken(hold.hold_token);
+        } catch (error) {
+            // The hold is best-effort: only a 400 means the slot is actually taken,
+            // anything else (rate limit, network, server error) lets the visitor carry on
+            if (error.response?.status !== 400) {
+                console.warn('Could not hold the selected slot:', error);
+                return;
+            }
+            setSelectedSlot(null);
+            setModal({
+                isOpen: true,
+                type: 'warning',
+                title: 'Slot Unavailable',
+                message: error.response.data?.message || 'This time slot is no longer available. Please choose another time.'
+            });
+            fetchSlots();
         }
     };
 
@@ -121,7 +157,8 @@ const Booking = () => {
                 projectType: formData.projectType,
                 budget: formData.budget,
                 message: formData.message,
-                datetime: selectedSlot.datetime
+                datetime: selectedSlot.datetime,
+                holdToken
             };
 
             // Log the booking data for debugging
@@ -148,6 +185,7 @@ const Booking = () => {
                 message: ''
             });
             setSelectedSlot(null);
+            setHoldToken(null);
             // Refresh slots
             fetchSlots();
         } catch (error) {
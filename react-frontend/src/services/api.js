@@ -50,6 +50,42 @@ publicApi.interceptors.request.use((config) => {
     return config;
 }, (err) => Promise.reject(err));
 
+// Slot i of a compact day is free when bit (i % 4) of hex character i / 4 is set.
+// A string keeps days with any number of slots exact (JS shifts are 32-bit).
+export const isSlotFree = (free, i) => ((parseInt(free[i >> 2] || '0', 16) >> (i & 3)) & 1) === 1;
+
+// Expand the compact slots payload (shared templates + per-day free-slot bitstring)
+// into the verbose slot objects the booking calendar renders. Servers that ignore
+// `format=compact` answer with the verbose body, which is passed through unchanged.
+export const expandCompactSlots = (payload) => {
+    if (!payload || payload.format !== 'compact' || !Array.isArray(payload.days)) return payload;
+    const slots = [];
+    payload.days.forEach(({ date, template, free, utc_offset: utcOffset }) => {
+        const [year, month, day] = date.split('-').map(Number);
+        const dayDate = new Date(year, month - 1, day);
+        const dayName = dayDate.toLocaleDateString('en-US', { weekday: 'long' });
+        const dayShort = dayDate.toLocaleDateString('en-US', { weekday: 'short' });
+        const monthDay = dayDate.toLocaleDateString('en-US', { month: 'long', day: '2-digit' });
+        payload.templates[template].forEach((slot, i) => {
+            const available = isSlotFree(free, i);
+            const [hour, minute] = slot.time.split(':').map(Number);
+            const utc = new Date(Date.UTC(year, month - 1, day, hour, minute) - utcOffset * 60000);
+            slots.push({
+                datetime: `${date}T${slot.time}:00`,
+                utc: utc.toISOString().replace('.000Z', 'Z'),
+                display: `${dayName}, ${monthDay} at ${slot.label}`,
+                available,
+                booked: !available,
+                date,
+                time: slot.label,
+                day: dayName,
+                day_short: dayShort,
+            });
+        });
+    });
+    return { slots, from: payload.from, to: payload.to };
+};
+
 // API Service Methods
 export const apiService = {
     // Contact form submission
@@ -58,11 +94,12 @@ export const apiService = {
         return response.data;
     },
 
-    // Get available time slots
-    getAvailableSlots: async () => {
+    // Get available time slots; pass { from, to } (YYYY-MM-DD, both inclusive) to fetch a single window.
+    // Servers without the compact format answer with verbose slots, which are used as-is.
+    getAvailableSlots: async (range = {}) => {
         try {
-            const response = await publicApi.get(API_ENDPOINTS.AVAILABLE_SLOTS);
-            return response.data;
+            const response = await publicApi.get(API_ENDPOINTS.AVAILABLE_SLOTS, { params: { ...range, format: 'compact' } });
+            return expandCompactSlots(response.data);
         } catch (err) {
             // Provide clearer error message helpful for UI
             if (err.response && err.response.data) {
@@ -89,6 +126,13 @@ export const apiService = {
         }
     },
 
+    // Reserve a slot for a few minutes while the booking form is filled in.
+    // Passing the previous holdToken moves that hold to the new slot.
+    holdSlot: async (datetime, holdToken = null) => {
+        const response = await publicApi.post(API_ENDPOINTS.SLOT_HOLD, { datetime, hold_token: holdToken });
+        return response.data;
+    },
+
     // Book a meeting
     bookMeeting: async (data) => {
         const response = await publicApi.post(API_ENDPOINTS.BOOK_MEETING, data);
@@ -0,0 +1,54 @@
+import { expandCompactSlots, isSlotFree } from './api';
+
+// 08:00-17:45 every 15 minutes: 40 slots, more than a 32-bit shift can address
+const longTemplate = Array.from({ length: 40 }, (_, i) => {
+    const minutes = 8 * 60 + i * 15;
+    const time = `${String(Math.floor(minutes / 60)).padStart(2, '0')}:${String(minutes % 60).padStart(2, '0')}`;
+    return { time, label: time };
+});
+
+// Hex bitstring with every slot free except `taken` (four slots per character, lowest bit first)
+const freeBits = (count, taken) => {
+    let hex = '';
+    for (let i = 0; i < count; i += 4) {
+        let nibble = 0;
+        for (let bit = 0; bit < 4 && i + bit < count; bit += 1) {
+            if (!taken.includes(i + bit)) nibble |= 1 << bit;
+        }
+        hex += nibble.toString(16);
+    }
+    return hex;
+};
+
+describe('compact slot decoding', () => {
+    it('reads free flags past slot 32', () => {
+        const free = freeBits(40, [0, 33, 39]);
+        expect(isSlotFree(free, 0)).toBe(false);
+        expect(isSlotFree(free, 1)).toBe(true);
+        expect(isSlotFree(free, 32)).toBe(true);
+        expect(isSlotFree(free, 33)).toBe(false);
+        expect(isSlotFree(free, 39)).toBe(false);
+    });
+
+    it('expands a day with more than 32 slots', () => {
+        const payload = {
+            format: 'compact',
+            from: '2030-01-07',
+            to: '2030-01-08',
+            templates: [longTemplate],
+            days: [{ date: '2030-01-07', template: 0, free: freeBits(40, [33]), utc_offset: 0 }],
+        };
+
+        const { slots } = expandCompactSlots(payload);
+
+        expect(slots).toHaveLength(40);
+        expect(slots.filter((slot) => !slot.available).map((slot) => slot.datetime)).toEqual(['2030-01-07T16:15:00']);
+        expect(slots[39].available).toBe(true);
+        expect(slots[33].utc).toBe('2030-01-07T16:15:00Z');
+    });
+
+    it('passes a verbose body through unchanged', () => {
+        const verbose = { slots: [{ datetime: '2030-01-07T09:00:00', available: true }] };
+        expect(expandCompactSlots(verbose)).toBe(verbose);
+    });
+});
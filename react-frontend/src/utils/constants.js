@@ -13,6 +13,8 @@ export const API_ENDPOINTS = {
     CONTACT: '/contact',
     AVAILABLE_SLOTS: '/api/available-slots',
     BOOK_MEETING: '/book-meeting',
+    SLOT_HOLD: '/api/slots/hold',
+    SLOT_EVENTS: '/api/slots/events',
     LOGIN: '/api/login',
     LOGOUT: '/api/logout',
     ADMIN: '/admin',